@@ -0,0 +1,68 @@
+"""
+Clocks for game time
+
+Everything that times the game (engine lifespans, turn latency, when the
+next tick is due) reads one clock: call it for the current time in
+milliseconds. Swapping the clock changes how fast game time runs without
+touching the rules:
+
+    RealClock     wall time from a monotonic clock
+    ScaledClock   wall time sped up (or slowed down) by a factor
+    VirtualClock  time that only moves when advance() is called, e.g. by
+                  exactly one tick interval per tick in a headless run
+
+A loop that plays ticks back to back calls advance(ms) once per tick with
+the interval a real game would have waited; real clocks ignore it and
+virtual clocks move by it, so the same loop runs in either.
+"""
+
+import time
+
+
+class RealClock:
+    """Milliseconds from time.monotonic."""
+
+    def __call__(self):
+        return time.monotonic() * 1000
+
+    def advance(self, ms):
+        pass
+
+
+class ScaledClock:
+    """Another clock's time (real by default) running `scale` times as fast."""
+
+    def __init__(self, scale, source=None):
+        self.source = source or RealClock()
+        self.origin = self.source()
+        self.start = self.origin
+        self.scale = scale
+
+    def __call__(self):
+        return self.start + (self.source() - self.origin) * self.scale
+
+    def set_scale(self, scale):
+        """Change speed from now on without making time jump."""
+        self.start = self()
+        self.origin = self.source()
+        self.scale = scale
+
+    def advance(self, ms):
+        pass
+
+
+class VirtualClock:
+    """Time that moves only through advance(); `step` ms when none is given."""
+
+    def __init__(self, start=0, step=0):
+        self.now = start
+        self.step = step
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms=None):
+        self.now += self.step if ms is None else ms
+
+
+wall_clock = RealClock()
@@ -1,22 +1,38 @@
 import pygame
+import argparse
 import sys
-import random
-import time
 import os
 import json
+import logging
+
+import game_log
+from telemetry import NullTelemetry, TelemetryWriter
+from rewind import RewindBuffer
+import levels
+from frame_pacer import MODES, FramePacer, enable_vsync, wait_for_events
+import snake_net
+from sound_cache import load_sound, music_file
+from sound_service import AudioService
+from clocks import VirtualClock, wall_clock
+from snake_engine import SnakeEngine
+from snake_renderers import PygameRenderer
+
+# Logging is set up before anything below runs at import time; --verbose
+# brings back the full startup and sound diagnostics
+log = game_log.setup("snake", verbose="--verbose" in sys.argv[1:])
 
 # Initialize pygame
 pygame.init()
-print(f"Pygame initialized: {pygame.get_init()}")
+log.debug("Pygame initialized: %s", pygame.get_init())
 
 # Initialize sound mixer with specific settings for better compatibility
 try:
     pygame.mixer.quit()  # Reset the mixer if it was already initialized
     pygame.mixer.init(44100, -16, 2, 512)  # CD quality audio
-    print(f"Pygame mixer initialized: {pygame.mixer.get_init()}")
-    print(f"Mixer settings: frequency={pygame.mixer.get_init()[0]}, size={pygame.mixer.get_init()[1]}, channels={pygame.mixer.get_init()[2]}")
+    log.debug("Pygame mixer initialized: %s", pygame.mixer.get_init())
+    log.debug("Mixer settings: frequency=%d, size=%d, channels=%d", *pygame.mixer.get_init())
 except Exception as e:
-    print(f"Error initializing mixer: {e}")
+    log.error("Error initializing mixer: %s", e)
 
 # Constants
 WIDTH, HEIGHT = 800, 600
@@ -39,10 +55,12 @@ FPS = 60
 DEFAULT_ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snake_game_assets")
 USER_SOUNDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
 
-# Print the actual paths for debugging
-print(f"Default assets directory: {DEFAULT_ASSETS_DIR}")
-print(f"User sounds directory: {USER_SOUNDS_DIR}")
+# Log the actual paths for debugging
+log.debug("Default assets directory: %s", DEFAULT_ASSETS_DIR)
+log.debug("User sounds directory: %s", USER_SOUNDS_DIR)
 HIGHSCORE_FILE = os.path.join(DEFAULT_ASSETS_DIR, "highscores.json")
+TELEMETRY_FILE = os.path.join(DEFAULT_ASSETS_DIR, "telemetry.jsonl")
+SAVE_FILE = os.path.join(DEFAULT_ASSETS_DIR, "savegame.bin")
 
 # Difficulty settings
 DIFFICULTY_LEVELS = {
@@ -62,78 +80,76 @@ font = pygame.font.Font(None, 36)
 large_font = pygame.font.Font(None, 72)
 small_font = pygame.font.Font(None, 24)
 
+# The board is drawn by the shared pygame renderer; game rules live in snake_engine
+renderer = PygameRenderer(screen, GRID_SIZE, {name: level["color"] for name, level in DIFFICULTY_LEVELS.items()},
+                          game_over_hints=("Press R to Restart", "Press M for Menu", "Press [ to Rewind"),
+                          paused_hints=("Press P to Continue", "[ and ] to Rewind, Shift for 1 second"))
+
 # Load sounds
 try:
-    print("\n--- SOUND SYSTEM DEBUGGING ---")
-    print(f"Current working directory: {os.getcwd()}")
-    
-    # Check if sound directories exist
-    print(f"Default assets sounds directory exists: {os.path.exists(os.path.join(DEFAULT_ASSETS_DIR, 'sounds'))}")
-    print(f"User sounds directory exists: {os.path.exists(USER_SOUNDS_DIR)}")
-    
-    # List all files in sound directories
-    print("\nFiles in default assets sounds directory:")
-    try:
-        sound_files = os.listdir(os.path.join(DEFAULT_ASSETS_DIR, 'sounds'))
-        for file in sound_files:
-            print(f"  - {file}")
-    except Exception as e:
-        print(f"  Error listing files: {e}")
-    
-    print("\nFiles in user sounds directory:")
-    try:
-        sound_files = os.listdir(USER_SOUNDS_DIR)
-        for file in sound_files:
-            print(f"  - {file}")
-    except Exception as e:
-        print(f"  Error listing files: {e}")
+    # Only touch the disk for the directory report when it will be shown
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("--- SOUND SYSTEM DEBUGGING ---")
+        log.debug("Current working directory: %s", os.getcwd())
+        
+        # Check if sound directories exist
+        log.debug("Default assets sounds directory exists: %s", os.path.exists(os.path.join(DEFAULT_ASSETS_DIR, 'sounds')))
+        log.debug("User sounds directory exists: %s", os.path.exists(USER_SOUNDS_DIR))
+        
+        # List all files in sound directories
+        for label, directory in (("default assets sounds", os.path.join(DEFAULT_ASSETS_DIR, 'sounds')),
+                                 ("user sounds", USER_SOUNDS_DIR)):
+            try:
+                log.debug("Files in %s directory: %s", label, ", ".join(os.listdir(directory)))
+            except Exception as e:
+                log.debug("Error listing files in %s directory: %s", label, e)
     
     # Try to load WAV files first, then MP3 if WAV not found
     # Check both the default assets directory and the user's sounds directory
     def try_load_sound(filename):
-        print(f"\nAttempting to load sound: {filename}")
+        log.debug("Attempting to load sound: %s", filename)
         
         # Try in the default assets directory first (since you moved files there)
         default_path = os.path.join(DEFAULT_ASSETS_DIR, "sounds", filename)
         if os.path.exists(default_path):
-            print(f"  Found sound file in default directory: {default_path}")
+            log.debug("Found sound file in default directory: %s", default_path)
             try:
-                sound = pygame.mixer.Sound(default_path)
-                print(f"  Successfully loaded sound from: {default_path}")
+                sound = load_sound(default_path)
+                log.debug("Successfully loaded sound from: %s", default_path)
                 return sound
             except Exception as e:
-                print(f"  Error loading sound from default directory {filename}: {e}")
+                log.warning("Error loading sound from default directory %s: %s", filename, e)
         else:
-            print(f"  File not found in default directory: {default_path}")
+            log.debug("File not found in default directory: %s", default_path)
         
         # Try in the user's sounds directory
         try:
             normal_path = os.path.join(USER_SOUNDS_DIR, filename)
             if os.path.exists(normal_path):
-                print(f"  Found sound file: {normal_path}")
-                sound = pygame.mixer.Sound(normal_path)
-                print(f"  Successfully loaded sound from: {normal_path}")
+                log.debug("Found sound file: %s", normal_path)
+                sound = load_sound(normal_path)
+                log.debug("Successfully loaded sound from: %s", normal_path)
                 return sound
             else:
-                print(f"  File not found: {normal_path}")
+                log.debug("File not found: %s", normal_path)
         except Exception as e:
-            print(f"  Error loading sound {filename}: {e}")
+            log.warning("Error loading sound %s: %s", filename, e)
         
         # Try with double extension
         try:
             # Check for files with double extensions (e.g., eat.wav.wav)
             double_ext = os.path.join(USER_SOUNDS_DIR, filename + "." + filename.split(".")[-1])
             if os.path.exists(double_ext):
-                print(f"  Found sound file with double extension: {double_ext}")
-                sound = pygame.mixer.Sound(double_ext)
-                print(f"  Successfully loaded sound from: {double_ext}")
+                log.debug("Found sound file with double extension: %s", double_ext)
+                sound = load_sound(double_ext)
+                log.debug("Successfully loaded sound from: %s", double_ext)
                 return sound
             else:
-                print(f"  File not found with double extension: {double_ext}")
+                log.debug("File not found with double extension: %s", double_ext)
         except Exception as e:
-            print(f"  Error loading double extension sound {filename}: {e}")
+            log.warning("Error loading double extension sound %s: %s", filename, e)
         
-        print(f"  Could not find or load sound: {filename}")
+        log.debug("Could not find or load sound: %s", filename)
         return None
     
     # Load eat sound
@@ -154,68 +170,74 @@ try:
     # Set maximum volume for all sounds
     if eat_sound:
         eat_sound.set_volume(1.0)
-        print("Eat sound volume set to maximum")
+        log.debug("Eat sound volume set to maximum")
     if game_over_sound:
         game_over_sound.set_volume(1.0)
-        print("Game over sound volume set to maximum")
+        log.debug("Game over sound volume set to maximum")
     if powerup_sound:
         powerup_sound.set_volume(1.0)
-        print("Power-up sound volume set to maximum")
+        log.debug("Power-up sound volume set to maximum")
     
 except Exception as e:
-    print(f"Warning: Error loading sound files: {e}")
+    log.warning("Error loading sound files: %s", e)
     eat_sound = None
     game_over_sound = None
     powerup_sound = None
 
+# Sound effects are played from a background thread so the game loop never waits on audio
+audio = AudioService()
+audio.add("eat", eat_sound, priority=1)
+audio.add("powerup", powerup_sound, priority=2)
+audio.add("game_over", game_over_sound, priority=3)
+
 # Try to load background music
 try:
-    print("\n--- BACKGROUND MUSIC DEBUGGING ---")
+    log.debug("--- BACKGROUND MUSIC DEBUGGING ---")
     
     # Define a function to try loading music from different locations
     def try_load_music(filename):
-        print(f"Attempting to load music: {filename}")
+        log.debug("Attempting to load music: %s", filename)
         
         # Try in the default assets directory first (since you moved files there)
         default_path = os.path.join(DEFAULT_ASSETS_DIR, "sounds", filename)
         if os.path.exists(default_path):
-            print(f"  Found music file in default directory: {default_path}")
+            log.debug("Found music file in default directory: %s", default_path)
             try:
-                pygame.mixer.music.load(default_path)
-                print(f"  Successfully loaded music from: {default_path}")
+                pygame.mixer.music.load(music_file(default_path))
+                log.debug("Successfully loaded music from: %s", default_path)
                 return True
             except Exception as e:
-                print(f"  Error loading music from default directory {filename}: {e}")
+                log.warning("Error loading music from default directory %s: %s", filename, e)
         else:
-            print(f"  File not found in default directory: {default_path}")
+            log.debug("File not found in default directory: %s", default_path)
         
         # Try in the user's sounds directory with normal extension
         normal_path = os.path.join(USER_SOUNDS_DIR, filename)
         if os.path.exists(normal_path):
-            print(f"  Found music file: {normal_path}")
+            log.debug("Found music file: %s", normal_path)
             try:
-                pygame.mixer.music.load(normal_path)
-                print(f"  Successfully loaded music from: {normal_path}")
+                pygame.mixer.music.load(music_file(normal_path))
+                log.debug("Successfully loaded music from: %s", normal_path)
                 return True
             except Exception as e:
-                print(f"  Error loading music {filename}: {e}")
+                log.warning("Error loading music %s: %s", filename, e)
         else:
-            print(f"  File not found: {normal_path}")
+            log.debug("File not found: %s", normal_path)
         
         # Try with double extension
         double_ext = os.path.join(USER_SOUNDS_DIR, filename + "." + filename.split(".")[-1])
         if os.path.exists(double_ext):
-            print(f"  Found music file with double extension: {double_ext}")
+            log.debug("Found music file with double extension: %s", double_ext)
             try:
-                pygame.mixer.music.load(double_ext)
-                print(f"  Successfully loaded music from: {double_ext}")
+                pygame.mixer.music.load(music_file(double_ext))
+                log.debug("Successfully loaded music from: %s", double_ext)
                 return True
             except Exception as e:
-                print(f"  Error loading music with double extension {filename}: {e}")
+                log.warning("Error loading music with double extension %s: %s", filename, e)
         else:
-            print(f"  File not found with double extension: {double_ext}")
+            log.debug("File not found with double extension: %s", double_ext)
         
-        print(f"  Could not find or load music: {filename}")
+        log.debug("Could not find or load music: %s", filename)
         return False
     
     # Try to load background music (MP3 first, then WAV)
@@ -223,291 +245,41 @@ try:
     if not has_bg_music:
         has_bg_music = try_load_music("background.wav")
     
-    print(f"Background music loaded: {has_bg_music}")
+    log.debug("Background music loaded: %s", has_bg_music)
     
 except Exception as e:
-    print(f"Warning: Error loading background music: {e}")
+    log.warning("Error loading background music: %s", e)
     has_bg_music = False
 
-# Particle effect class
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(2, 5)
-        self.life = 30
-        self.vx = random.uniform(-1, 1)
-        self.vy = random.uniform(-1, 1)
-    
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.size = max(0, self.size - 0.1)
-    
-    def draw(self):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.size))
-
-class Snake:
-    def __init__(self):
-        self.positions = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = (1, 0)  # Start moving right
-        self.grow = False
-        self.color = GREEN  # Default color
-        self.speed_boost = False
-        self.speed_boost_timer = 0
-        self.invincible = False
-        self.invincible_timer = 0
-        self.double_score = False
-        self.double_score_timer = 0
-    
-    def get_head_position(self):
-        return self.positions[0]
-    
-    def update(self, wall_collision):
-        head = self.get_head_position()
-        x, y = self.direction
-        
-        # Calculate new position
-        new_x = head[0] + x
-        new_y = head[1] + y
-        
-        # Handle wall collision based on game mode
-        if wall_collision:
-            # Check if snake hits the wall
-            if new_x < 0 or new_x >= GRID_WIDTH or new_y < 0 or new_y >= GRID_HEIGHT:
-                return True  # Game over
-            new_position = (new_x, new_y)
-        else:
-            # Wrap around the screen
-            new_position = (new_x % GRID_WIDTH, new_y % GRID_HEIGHT)
-        
-        # Check for collision with self (unless invincible)
-        if not self.invincible and new_position in self.positions[1:]:
-            return True  # Game over
-        
-        self.positions.insert(0, new_position)
-        
-        if not self.grow:
-            self.positions.pop()
-        else:
-            self.grow = False
-        
-        # Update power-up timers
-        if self.speed_boost:
-            self.speed_boost_timer -= 1
-            if self.speed_boost_timer <= 0:
-                self.speed_boost = False
-        
-        if self.invincible:
-            self.invincible_timer -= 1
-            if self.invincible_timer <= 0:
-                self.invincible = False
-        
-        if self.double_score:
-            self.double_score_timer -= 1
-            if self.double_score_timer <= 0:
-                self.double_score = False
-        
-        return False  # Game continues
-    
-    def change_direction(self, direction):
-        # Prevent 180-degree turns
-        if (direction[0] * -1, direction[1] * -1) != self.direction:
-            self.direction = direction
-    
-    def grow_snake(self):
-        self.grow = True
-    
-    def draw(self):
-        # Draw snake body
-        for i, position in enumerate(self.positions):
-            rect = pygame.Rect(position[0] * GRID_SIZE, position[1] * GRID_SIZE, 
-                              GRID_SIZE, GRID_SIZE)
-            
-            # Special effects for power-ups
-            if i == 0:  # Head
-                color = self.color
-                if self.invincible:
-                    # Flashing effect for invincibility
-                    if pygame.time.get_ticks() % 200 < 100:
-                        color = WHITE
-            elif self.speed_boost and i < 3:
-                # Speed boost effect on first few segments
-                color = YELLOW
-            elif self.double_score and i < 3:
-                # Double score effect on first few segments
-                color = PURPLE
-            else:
-                # Normal body color with gradient effect
-                color = self.color
-                
-            pygame.draw.rect(screen, color, rect)
-            pygame.draw.rect(screen, WHITE, rect, 1)  # Border
-
-class Food:
-    def __init__(self):
-        self.position = (0, 0)
-        self.type = "normal"  # normal, bonus, or special
-        self.color = RED
-        self.points = 1
-        self.spawn_time = pygame.time.get_ticks()
-        self.lifespan = None  # None means permanent
-        self.randomize_position()
-    
-    def randomize_position(self):
-        self.position = (random.randint(0, GRID_WIDTH - 1), 
-                        random.randint(0, GRID_HEIGHT - 1))
-        
-        # Randomly determine food type
-        food_type = random.random()
-        if food_type < 0.7:  # 70% chance for normal food
-            self.type = "normal"
-            self.color = RED
-            self.points = 1
-            self.lifespan = None
-        elif food_type < 0.9:  # 20% chance for bonus food
-            self.type = "bonus"
-            self.color = ORANGE
-            self.points = 3
-            self.lifespan = 5000  # 5 seconds
-        else:  # 10% chance for special food (power-up)
-            self.type = "special"
-            self.color = PURPLE
-            self.points = 2
-            self.lifespan = 7000  # 7 seconds
-        
-        self.spawn_time = pygame.time.get_ticks()
-    
-    def update(self):
-        # Check if temporary food should disappear
-        if self.lifespan and pygame.time.get_ticks() - self.spawn_time > self.lifespan:
-            return True  # Food should be replaced
-        return False
-    
-    def draw(self):
-        rect = pygame.Rect(self.position[0] * GRID_SIZE, self.position[1] * GRID_SIZE, 
-                          GRID_SIZE, GRID_SIZE)
-        
-        # Pulsating effect for special foods
-        if self.type != "normal":
-            pulse = (pygame.time.get_ticks() % 1000) / 1000.0
-            size_mod = int(GRID_SIZE * (0.8 + 0.2 * pulse))
-            pulse_rect = pygame.Rect(
-                self.position[0] * GRID_SIZE + (GRID_SIZE - size_mod) // 2,
-                self.position[1] * GRID_SIZE + (GRID_SIZE - size_mod) // 2,
-                size_mod, size_mod
-            )
-            pygame.draw.rect(screen, self.color, pulse_rect)
-        else:
-            pygame.draw.rect(screen, self.color, rect)
-        
-        pygame.draw.rect(screen, WHITE, rect, 1)  # Border
-
-class Obstacle:
-    def __init__(self):
-        self.positions = []
-        self.generate()
-    
-    def generate(self):
-        self.positions = []
-        # Create 5-10 random obstacles
-        num_obstacles = random.randint(5, 10)
-        for _ in range(num_obstacles):
-            pos = (random.randint(2, GRID_WIDTH - 3), random.randint(2, GRID_HEIGHT - 3))
-            # Make sure obstacles aren't too close to the center where the snake starts
-            if abs(pos[0] - GRID_WIDTH // 2) > 3 or abs(pos[1] - GRID_HEIGHT // 2) > 3:
-                self.positions.append(pos)
-    
-    def draw(self):
-        for position in self.positions:
-            rect = pygame.Rect(position[0] * GRID_SIZE, position[1] * GRID_SIZE, 
-                              GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(screen, (100, 100, 100), rect)
-            pygame.draw.rect(screen, WHITE, rect, 1)  # Border
-
-class PowerUp:
-    def __init__(self):
-        self.position = (0, 0)
-        self.active = False
-        self.type = None
-        self.spawn_time = 0
-        self.lifespan = 10000  # 10 seconds
-    
-    def spawn(self, snake_positions):
-        if not self.active and random.random() < 0.02:  # 2% chance per frame to spawn
-            self.position = (random.randint(0, GRID_WIDTH - 1), 
-                            random.randint(0, GRID_HEIGHT - 1))
-            
-            # Make sure it doesn't spawn on the snake
-            while self.position in snake_positions:
-                self.position = (random.randint(0, GRID_WIDTH - 1), 
-                                random.randint(0, GRID_HEIGHT - 1))
-            
-            # Choose a random power-up type
-            self.type = random.choice(["speed", "invincible", "double_score"])
-            self.active = True
-            self.spawn_time = pygame.time.get_ticks()
-    
-    def update(self):
-        if self.active and pygame.time.get_ticks() - self.spawn_time > self.lifespan:
-            self.active = False
-    
-    def draw(self):
-        if self.active:
-            rect = pygame.Rect(self.position[0] * GRID_SIZE, self.position[1] * GRID_SIZE, 
-                              GRID_SIZE, GRID_SIZE)
-            
-            if self.type == "speed":
-                color = YELLOW
-            elif self.type == "invincible":
-                color = WHITE
-            else:  # double_score
-                color = PURPLE
-            
-            # Pulsating effect
-            pulse = (pygame.time.get_ticks() % 1000) / 1000.0
-            size_mod = int(GRID_SIZE * (0.7 + 0.3 * pulse))
-            pulse_rect = pygame.Rect(
-                self.position[0] * GRID_SIZE + (GRID_SIZE - size_mod) // 2,
-                self.position[1] * GRID_SIZE + (GRID_SIZE - size_mod) // 2,
-                size_mod, size_mod
-            )
-            
-            pygame.draw.rect(screen, color, pulse_rect)
-            pygame.draw.rect(screen, WHITE, rect, 1)  # Border
-
-class Game:
-    def __init__(self):
-        self.snake = Snake()
-        self.food = Food()
-        self.obstacles = Obstacle()
-        self.power_up = PowerUp()
-        self.score = 0
+class Game(SnakeEngine):
+    def __init__(self, difficulty="Easy", telemetry=None, level=None, clock=wall_clock):
+        # level is a levels.KINDS layout or "any"; None scatters a few random blocks
+        layout = None
+        if level is not None:
+            layout = levels.load_level(GRID_WIDTH, GRID_HEIGHT, None if level == "any" else level)
+        super().__init__(GRID_WIDTH, GRID_HEIGHT, clock=clock, level=layout)
+        self.telemetry = telemetry or NullTelemetry()
+        self.rewind = RewindBuffer(self)  # Last 10 s or so of ticks, scrubbed with [ and ]
         self.high_scores = self.load_high_scores()
-        self.game_over = False
-        self.paused = False
-        self.difficulty = "Easy"
-        self.speed = DIFFICULTY_LEVELS[self.difficulty]["speed"]
-        self.wall_collision = DIFFICULTY_LEVELS[self.difficulty]["wall_collision"]
-        self.snake.color = DIFFICULTY_LEVELS[self.difficulty]["color"]
-        self.particles = []
-        self.last_update_time = pygame.time.get_ticks()
+        self.change_difficulty(difficulty)
+        self.telemetry.emit("start", difficulty=difficulty, wall_collision=self.wall_collision,
+                            level=level or "random", obstacles=len(self.obstacles))
         self.frame_time = 0
+        self.last_update = None   # Clock reading at the last running update()
+        self.turn_latencies = []  # ms each turn waited for its tick
         
         # Print sound file paths for debugging
-        print(f"Looking for sounds in: {USER_SOUNDS_DIR} and {DEFAULT_ASSETS_DIR}/sounds")
+        log.debug("Looking for sounds in: %s and %s/sounds", USER_SOUNDS_DIR, DEFAULT_ASSETS_DIR)
         
         # Start background music if available
         if has_bg_music:
             try:
-                print("Starting background music...")
+                log.debug("Starting background music...")
                 pygame.mixer.music.set_volume(1.0)  # Set to maximum volume
                 pygame.mixer.music.play(-1)  # Loop indefinitely
-                print("Background music started successfully")
+                log.debug("Background music started successfully")
             except Exception as e:
-                print(f"Error playing background music: {e}")
+                log.warning("Error playing background music: %s", e)
     
     def load_high_scores(self):
         try:
@@ -517,7 +289,7 @@ class Game:
                     return json.load(f)
             return {"Easy": 0, "Medium": 0, "Hard": 0, "Extreme": 0}
         except:
-            print("Error loading high scores")
+            log.warning("Error loading high scores")
             return {"Easy": 0, "Medium": 0, "Hard": 0, "Extreme": 0}
     
     def save_high_scores(self):
@@ -527,236 +299,158 @@ class Game:
             with open(highscore_file, 'w') as f:
                 json.dump(self.high_scores, f)
         except:
-            print("Error saving high scores")
+            log.warning("Error saving high scores")
     
     def update(self):
+        """Catch up with the game clock, ticking at the current speed."""
         if self.paused or self.game_over:
+            # Time spent here is not played: resume from the next reading
+            self.last_update = None
             return
         
-        # Calculate delta time for smooth movement
-        current_time = pygame.time.get_ticks()
-        dt = current_time - self.last_update_time
-        self.last_update_time = current_time
-        
-        # Accumulate frame time
-        self.frame_time += dt
-        
-        # Only update game logic at the specified speed
-        update_interval = 1000 // self.speed
-        if self.snake.speed_boost:
-            update_interval = update_interval // 2  # Double speed with boost
-        
-        if self.frame_time >= update_interval:
-            self.frame_time = 0
-            
-            # Update game objects
-            self.game_over = self.snake.update(self.wall_collision)
-            
-            # Check if snake ate food
-            if self.snake.get_head_position() == self.food.position:
-                self.snake.grow_snake()
-                
-                # Calculate points
-                points = self.food.points
-                if self.snake.double_score:
-                    points *= 2
-                
-                self.score += points
-                
-                # Create particle effect at food position
-                self.create_particles(
-                    self.food.position[0] * GRID_SIZE + GRID_SIZE // 2,
-                    self.food.position[1] * GRID_SIZE + GRID_SIZE // 2,
-                    self.food.color
-                )
-                
-                # Play sound effect with debug info
-                if eat_sound:
-                    try:
-                        print(f"Playing eat sound...")
-                        eat_sound.play()
-                        print(f"Eat sound played successfully")
-                    except Exception as e:
-                        print(f"Error playing eat sound: {e}")
-                else:
-                    print("Eat sound not available")
-                
-                # Generate new food
-                self.food.randomize_position()
-                # Make sure food doesn't appear on snake or obstacles
-                while (self.food.position in self.snake.positions or 
-                      self.food.position in self.obstacles.positions):
-                    self.food.randomize_position()
-            
-            # Check if food needs to be replaced (temporary foods)
-            if self.food.update():
-                self.food.randomize_position()
-                while (self.food.position in self.snake.positions or 
-                      self.food.position in self.obstacles.positions):
-                    self.food.randomize_position()
-            
-            # Check if snake hit an obstacle
-            if self.snake.get_head_position() in self.obstacles.positions and not self.snake.invincible:
-                self.game_over = True
-            
-            # Update power-up
-            self.power_up.update()
-            self.power_up.spawn(self.snake.positions)
-            
-            # Check if snake collected a power-up
-            if self.power_up.active and self.snake.get_head_position() == self.power_up.position:
-                if self.power_up.type == "speed":
-                    self.snake.speed_boost = True
-                    self.snake.speed_boost_timer = 100  # Duration in frames
-                elif self.power_up.type == "invincible":
-                    self.snake.invincible = True
-                    self.snake.invincible_timer = 100  # Duration in frames
-                elif self.power_up.type == "double_score":
-                    self.snake.double_score = True
-                    self.snake.double_score_timer = 100  # Duration in frames
-                
-                # Create particle effect at power-up position
-                self.create_particles(
-                    self.power_up.position[0] * GRID_SIZE + GRID_SIZE // 2,
-                    self.power_up.position[1] * GRID_SIZE + GRID_SIZE // 2,
-                    WHITE
-                )
-                
-                # Play power-up sound with debug info
-                if powerup_sound:
-                    try:
-                        print(f"Playing powerup sound...")
-                        powerup_sound.play()
-                        print(f"Powerup sound played successfully")
-                    except Exception as e:
-                        print(f"Error playing powerup sound: {e}")
-                else:
-                    print("Powerup sound not available")
-                
-                self.power_up.active = False
-        
-        # Update particles regardless of game speed
-        self.update_particles()
-        
-        # Check for game over
-        if self.game_over:
+        # Accumulate game time since the last frame
+        now = self.clock()
+        if self.last_update is not None:
+            self.frame_time += now - self.last_update
+        self.last_update = now
+        
+        # Only update game logic at the specified speed (double speed with boost).
+        # Carry the remainder so ticks stay evenly spaced; never bank more
+        # than one extra tick after a stall
+        interval = self.update_interval(1000 / self.speed)
+        if self.frame_time >= interval:
+            self.frame_time = min(self.frame_time - interval, interval)
+            for event in self.rewind.step():
+                self.handle_event(event)
+    
+    def handle_event(self, event):
+        if event[0] == "turn":
+            self.turn_latencies.append(event[2])
+        elif event[0] == "eat":
+            self.telemetry.emit("eat", tick=self.tick, food=event[2], x=event[1][0], y=event[1][1],
+                                points=event[3], score=self.score)
+            # Play sound effect
+            audio.play("eat")
+            log.debug("Ate food worth %d, score %d", event[3], self.score)
+        elif event[0] == "power_up":
+            # Play power-up sound
+            audio.play("powerup")
+            self.telemetry.emit("power_up", tick=self.tick, power_up=event[2], x=event[1][0], y=event[1][1])
+            log.debug("Collected %s power-up", event[2])
+        elif event[0] == "game_over":
+            self.telemetry.emit("death", tick=self.tick, cause=event[1], score=self.score,
+                                length=len(self.snake.positions), difficulty=self.difficulty)
             # Update high score if needed
-            if self.score > self.high_scores[self.difficulty]:
-                self.high_scores[self.difficulty] = self.score
+            if self.high_score > self.high_scores[self.difficulty]:
+                self.high_scores[self.difficulty] = self.high_score
                 self.save_high_scores()
             
-            # Play game over sound with debug info
-            if game_over_sound:
-                try:
-                    print(f"Playing game over sound...")
-                    game_over_sound.play()
-                    print(f"Game over sound played successfully")
-                except Exception as e:
-                    print(f"Error playing game over sound: {e}")
-            else:
-                print("Game over sound not available")
+            # Play game over sound
+            audio.play("game_over")
+            log.debug("Game over on %s (%s) with score %d", self.difficulty, event[1], self.score)
+            if self.turn_latencies:
+                log.debug("Input latency over %d turns: mean %.0f ms, max %d ms",
+                          len(self.turn_latencies),
+                          sum(self.turn_latencies) / len(self.turn_latencies),
+                          max(self.turn_latencies))
     
-    def create_particles(self, x, y, color):
-        # Create explosion effect
-        for _ in range(20):
-            self.particles.append(Particle(x, y, color))
+
+    def change_difficulty(self, difficulty):
+        if difficulty in DIFFICULTY_LEVELS:
+            # Choosing the starting difficulty is reported by the "start" event
+            if self.difficulty is not None:
+                self.telemetry.emit("difficulty", tick=self.tick, difficulty=difficulty)
+                self.rewind.mark()
+            self.difficulty = difficulty
+            self.speed = DIFFICULTY_LEVELS[difficulty]["speed"]
+            self.wall_collision = DIFFICULTY_LEVELS[difficulty]["wall_collision"]
+            self.high_score = self.high_scores.get(difficulty, 0)
     
-    def update_particles(self):
-        # Update and remove dead particles
-        self.particles = [p for p in self.particles if p.life > 0]
-        for particle in self.particles:
-            particle.update()
+    def toggle_wall_collision(self):
+        super().toggle_wall_collision()
+        self.telemetry.emit("walls", tick=self.tick, wall_collision=self.wall_collision)
+        self.rewind.mark()
+    
+    def scrub(self, ticks):
+        """Move through the rewind buffer (negative is back); play stays paused."""
+        self.paused = True
+        tick = self.rewind.seek(self.tick + ticks)
+        self.telemetry.emit("rewind", tick=tick)
+    
+    def check_difficulty(self, difficulty):
+        # Called before the engine is touched, so an unknown label leaves the game as it was
+        if difficulty not in DIFFICULTY_LEVELS:
+            raise ValueError(f"unknown difficulty {difficulty!r} in snapshot")
+
+    def restore(self, data):
+        super().restore(data)
+        # Speed and the best score follow the restored difficulty
+        self.speed = DIFFICULTY_LEVELS[self.difficulty]["speed"]
+        self.high_score = max(self.high_score or 0, self.high_scores.get(self.difficulty, 0))
+        self.frame_time = 0
+        self.last_update = None
+
+def save_game(game):
+    # Write beside the save and rename, so a crash never leaves half a file
+    try:
+        with open(SAVE_FILE + ".tmp", "wb") as f:
+            f.write(game.snapshot())
+        os.replace(SAVE_FILE + ".tmp", SAVE_FILE)
+        log.debug("Saved the game to %s", SAVE_FILE)
+    except OSError as e:
+        log.warning("Could not save the game: %s", e)
+
+def load_saved_game(telemetry, clock=wall_clock):
+    """The run left by the last quit, paused, or None. A save is resumed once."""
+    try:
+        with open(SAVE_FILE, "rb") as f:
+            data = f.read()
+        os.remove(SAVE_FILE)
+    except OSError:
+        return None
     
-    def draw(self):
-        screen.fill(BLACK)
-        
-        # Draw grid
-        for x in range(0, WIDTH, GRID_SIZE):
-            pygame.draw.line(screen, (40, 40, 40), (x, 0), (x, HEIGHT))
-        for y in range(0, HEIGHT, GRID_SIZE):
-            pygame.draw.line(screen, (40, 40, 40), (0, y), (WIDTH, y))
-        
-        # Draw game elements
-        self.obstacles.draw()
-        self.food.draw()
-        if self.power_up.active:
-            self.power_up.draw()
-        self.snake.draw()
-        
-        # Draw particles
-        for particle in self.particles:
-            particle.draw()
-        
-        # Draw score
-        score_text = font.render(f"Score: {self.score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        
-        # Draw high score
-        high_score_text = font.render(f"High Score: {self.high_scores[self.difficulty]}", True, WHITE)
-        screen.blit(high_score_text, (10, 50))
+    game = Game(clock=clock)
+    try:
+        game.restore(data)
+    except ValueError as e:
+        log.warning("Ignoring unreadable save %s: %s", SAVE_FILE, e)
+        return None
+    game.paused = True
+    game.telemetry = telemetry
+    telemetry.emit("resume", tick=game.tick, difficulty=game.difficulty, score=game.score)
+    return game
+
+def draw_difficulty_menu(options, selected, high_scores):
+    screen.fill(BLACK)
+    
+    title_text = large_font.render("Snake Game", True, GREEN)
+    subtitle_text = font.render("Select Difficulty", True, WHITE)
+    
+    screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 80))
+    screen.blit(subtitle_text, (WIDTH // 2 - subtitle_text.get_width() // 2, 150))
+    
+    for i, option in enumerate(options):
+        color = DIFFICULTY_LEVELS[option]["color"] if i == selected else WHITE
+        option_text = font.render(option, True, color)
         
-        # Draw difficulty
-        diff_text = font.render(f"Difficulty: {self.difficulty}", True, DIFFICULTY_LEVELS[self.difficulty]["color"])
-        screen.blit(diff_text, (WIDTH - diff_text.get_width() - 10, 10))
+        # Show high score for each difficulty
+        score_text = small_font.render(f"High Score: {high_scores.get(option, 0)}", True, WHITE)
         
-        # Draw wall mode
+        # Show if this mode has wall collision
         wall_text = small_font.render(
-            f"{'Wall Collision' if self.wall_collision else 'Screen Wrap'}", 
+            f"{'Wall Collision' if DIFFICULTY_LEVELS[option]['wall_collision'] else 'Screen Wrap'}", 
             True, WHITE
         )
-        screen.blit(wall_text, (WIDTH - wall_text.get_width() - 10, 50))
-        
-        # Draw active power-ups
-        power_up_y = 80
-        if self.snake.speed_boost:
-            speed_text = small_font.render("Speed Boost!", True, YELLOW)
-            screen.blit(speed_text, (WIDTH - speed_text.get_width() - 10, power_up_y))
-            power_up_y += 25
-        
-        if self.snake.invincible:
-            invincible_text = small_font.render("Invincible!", True, WHITE)
-            screen.blit(invincible_text, (WIDTH - invincible_text.get_width() - 10, power_up_y))
-            power_up_y += 25
-        
-        if self.snake.double_score:
-            double_text = small_font.render("Double Score!", True, PURPLE)
-            screen.blit(double_text, (WIDTH - double_text.get_width() - 10, power_up_y))
-        
-        # Draw game over message
-        if self.game_over:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))  # Semi-transparent black
-            screen.blit(overlay, (0, 0))
-            
-            game_over_text = large_font.render("GAME OVER", True, RED)
-            restart_text = font.render("Press R to Restart", True, WHITE)
-            menu_text = font.render("Press M for Menu", True, WHITE)
-            
-            screen.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 2 - 80))
-            screen.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2))
-            screen.blit(menu_text, (WIDTH // 2 - menu_text.get_width() // 2, HEIGHT // 2 + 40))
         
-        # Draw pause overlay
-        elif self.paused:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))  # Semi-transparent black
-            screen.blit(overlay, (0, 0))
-            
-            pause_text = large_font.render("PAUSED", True, WHITE)
-            continue_text = font.render("Press P to Continue", True, WHITE)
-            
-            screen.blit(pause_text, (WIDTH // 2 - pause_text.get_width() // 2, HEIGHT // 2 - 50))
-            screen.blit(continue_text, (WIDTH // 2 - continue_text.get_width() // 2, HEIGHT // 2 + 20))
+        y_pos = 200 + i * 70
+        screen.blit(option_text, (WIDTH // 2 - option_text.get_width() // 2, y_pos))
+        screen.blit(score_text, (WIDTH // 2 - score_text.get_width() // 2, y_pos + 30))
+        screen.blit(wall_text, (WIDTH // 2 - wall_text.get_width() // 2, y_pos + 50))
     
-    def change_difficulty(self, difficulty):
-        if difficulty in DIFFICULTY_LEVELS:
-            self.difficulty = difficulty
-            self.speed = DIFFICULTY_LEVELS[difficulty]["speed"]
-            self.wall_collision = DIFFICULTY_LEVELS[difficulty]["wall_collision"]
-            self.snake.color = DIFFICULTY_LEVELS[difficulty]["color"]
+    controls_text = small_font.render("Controls: Arrow Keys to move, P to pause, W to toggle wall collision", True, WHITE)
+    screen.blit(controls_text, (WIDTH // 2 - controls_text.get_width() // 2, HEIGHT - 50))
     
-    def toggle_wall_collision(self):
-        self.wall_collision = not self.wall_collision
+    pygame.display.flip()
 
 def show_difficulty_menu():
     menu_active = True
@@ -773,83 +467,96 @@ def show_difficulty_menu():
     except:
         high_scores = {diff: 0 for diff in options}
     
+    # The menu is a still picture: draw it, then sleep until a key changes it
+    draw_difficulty_menu(options, selected, high_scores)
     while menu_active:
-        for event in pygame.event.get():
+        redraw = False
+        for event in wait_for_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            elif event.type == pygame.VIDEOEXPOSE:
+                redraw = True
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
                     selected = (selected - 1) % len(options)
+                    redraw = True
                 elif event.key == pygame.K_DOWN:
                     selected = (selected + 1) % len(options)
+                    redraw = True
                 elif event.key == pygame.K_RETURN:
                     menu_active = False
         
-        screen.fill(BLACK)
-        
-        title_text = large_font.render("Snake Game", True, GREEN)
-        subtitle_text = font.render("Select Difficulty", True, WHITE)
-        
-        screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 80))
-        screen.blit(subtitle_text, (WIDTH // 2 - subtitle_text.get_width() // 2, 150))
-        
-        for i, option in enumerate(options):
-            color = DIFFICULTY_LEVELS[option]["color"] if i == selected else WHITE
-            option_text = font.render(option, True, color)
-            
-            # Show high score for each difficulty
-            score_text = small_font.render(f"High Score: {high_scores.get(option, 0)}", True, WHITE)
-            
-            # Show if this mode has wall collision
-            wall_text = small_font.render(
-                f"{'Wall Collision' if DIFFICULTY_LEVELS[option]['wall_collision'] else 'Screen Wrap'}", 
-                True, WHITE
-            )
-            
-            y_pos = 200 + i * 70
-            screen.blit(option_text, (WIDTH // 2 - option_text.get_width() // 2, y_pos))
-            screen.blit(score_text, (WIDTH // 2 - score_text.get_width() // 2, y_pos + 30))
-            screen.blit(wall_text, (WIDTH // 2 - wall_text.get_width() // 2, y_pos + 50))
-        
-        controls_text = small_font.render("Controls: Arrow Keys to move, P to pause, W to toggle wall collision", True, WHITE)
-        screen.blit(controls_text, (WIDTH // 2 - controls_text.get_width() // 2, HEIGHT - 50))
-        
-        pygame.display.flip()
-        clock.tick(10)
+        if redraw and menu_active:
+            draw_difficulty_menu(options, selected, high_scores)
     
     return options[selected]
 
-def main():
+def create_pacer(pacing):
+    if pacing == "vsync":
+        refresh_rate = enable_vsync((WIDTH, HEIGHT))
+        if refresh_rate is None:
+            log.warning("Vsync is not available with this display driver; using precise pacing")
+            return FramePacer(FPS, "precise")
+        log.debug("Locked to the display refresh rate of %d Hz", refresh_rate)
+        return FramePacer(refresh_rate, "vsync")
+    return FramePacer(FPS, pacing)
+
+def main(pacing="sleep", telemetry_path=None, level=None):
     # Create asset directories if they don't exist
     os.makedirs(os.path.join(DEFAULT_ASSETS_DIR, "sounds"), exist_ok=True)
     os.makedirs(os.path.join(DEFAULT_ASSETS_DIR, "images"), exist_ok=True)
     
+    pacer = create_pacer(pacing)
+    # All game time (tick cadence, lifespans, turn latency) comes from one
+    # clock. Locked to the display, it moves exactly one refresh per frame
+    game_clock = VirtualClock() if pacer.mode == "vsync" else wall_clock
+    frames = 0
+    telemetry = TelemetryWriter(telemetry_path) if telemetry_path else NullTelemetry()
+    resumed = load_saved_game(telemetry, game_clock)
+    
     while True:
-        # Show difficulty menu
-        selected_difficulty = show_difficulty_menu()
-        
-        # Initialize game
-        game = Game()
-        game.change_difficulty(selected_difficulty)
+        if resumed:
+            # Pick up the run that was open when the game was last closed
+            game, resumed = resumed, None
+            selected_difficulty = game.difficulty
+        else:
+            # Show difficulty menu
+            selected_difficulty = show_difficulty_menu()
+            
+            # Initialize game
+            game = Game(selected_difficulty, telemetry, level, game_clock)
         
         # Main game loop
         running = True
         while running:
-            for event in pygame.event.get():
+            # Paused and game-over screens do not move: block until input
+            # instead of presenting the same frame 60 times a second
+            idle = game.paused or game.game_over
+            for event in wait_for_events() if idle else pygame.event.get():
                 if event.type == pygame.QUIT:
+                    # Closing the window keeps an unfinished run for next time
+                    if not game.game_over:
+                        save_game(game)
                     pygame.quit()
                     sys.exit()
+                elif event.type == pygame.VIDEOEXPOSE:
+                    # The window system lost our pixels; present the frame again
+                    renderer.invalidate()
                 elif event.type == pygame.KEYDOWN:
-                    if not game.game_over:
+                    if event.key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET) and (game.paused or game.game_over):
+                        # Rewind or replay one tick, or a second's worth with Shift
+                        ticks = game.speed if event.mod & pygame.KMOD_SHIFT else 1
+                        game.scrub(-ticks if event.key == pygame.K_LEFTBRACKET else ticks)
+                    elif not game.game_over:
                         if event.key == pygame.K_UP:
-                            game.snake.change_direction((0, -1))
+                            game.change_direction((0, -1))
                         elif event.key == pygame.K_DOWN:
-                            game.snake.change_direction((0, 1))
+                            game.change_direction((0, 1))
                         elif event.key == pygame.K_LEFT:
-                            game.snake.change_direction((-1, 0))
+                            game.change_direction((-1, 0))
                         elif event.key == pygame.K_RIGHT:
-                            game.snake.change_direction((1, 0))
+                            game.change_direction((1, 0))
                         # Pause game
                         elif event.key == pygame.K_p:
                             game.paused = not game.paused
@@ -874,17 +581,107 @@ def main():
                     else:
                         if event.key == pygame.K_r:
                             # Restart game with same difficulty
-                            game = Game()
-                            game.change_difficulty(selected_difficulty)
+                            game = Game(selected_difficulty, telemetry, level, game_clock)
                         elif event.key == pygame.K_m:
                             # Return to menu
                             running = False
             
+            if game.paused or game.game_over:
+                # Redraws only if the input changed what the overlay shows
+                renderer.draw(game)
+                game.update()
+                pacer.reset()
+                continue
+            
+            # A virtual clock moves by the frame the pacer waited for
+            game_clock.advance(pacer.tick())
             game.update()
-            game.draw()
+            renderer.draw(game)
             
-            pygame.display.flip()
+            # Frame timing report for --verbose, every 10 seconds at 60 FPS
+            frames += 1
+            if frames % 600 == 0 and log.isEnabledFor(logging.DEBUG):
+                log.debug("%s", pacer.format_stats())
+
+def run_network_game(host, port):
+    # Connect to a snake_server.py instance; the server owns the game state
+    client = snake_net.NetworkClient(host, port)
+    log.info("Connected to %s:%d", host, port)
+    key_directions = {
+        pygame.K_UP: (0, -1),
+        pygame.K_DOWN: (0, 1),
+        pygame.K_LEFT: (-1, 0),
+        pygame.K_RIGHT: (1, 0),
+    }
+    
+    while client.connected:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                client.close()
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key in key_directions:
+                client.send_direction(key_directions[event.key])
+        
+        client.poll()
+        if client.width is None:
             clock.tick(FPS)
+            continue
+        
+        screen.fill(BLACK)
+        
+        # Scale the server board to the window
+        cell_w = WIDTH // client.width
+        cell_h = HEIGHT // client.height
+        for index, points in client.food.items():
+            x, y = index % client.width, index // client.width
+            color = RED if points == 1 else ORANGE
+            screen.fill(color, (x * cell_w, y * cell_h, cell_w, cell_h))
+        
+        my_length = 0
+        for index, owner in client.cells.items():
+            x, y = index % client.width, index // client.width
+            if owner == client.snake_id:
+                color = GREEN
+                my_length += 1
+            else:
+                color = BLUE
+            rect = pygame.Rect(x * cell_w, y * cell_h, cell_w, cell_h)
+            pygame.draw.rect(screen, color, rect)
+            pygame.draw.rect(screen, WHITE, rect, 1)  # Border
+        
+        length_text = font.render(f"Length: {my_length}", True, WHITE)
+        screen.blit(length_text, (10, 10))
+        
+        net_text = small_font.render(
+            f"Tick {client.tick}  {client.bytes_per_tick():.0f} bytes/tick", True, WHITE
+        )
+        screen.blit(net_text, (WIDTH - net_text.get_width() - 10, 10))
+        
+        pygame.display.flip()
+        clock.tick(FPS)
+    
+    log.warning("Disconnected from server")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Enhanced Snake Game")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="join a multiplayer game hosted by snake_server.py")
+    # Read at import time (see game_log.setup above); listed here for --help
+    parser.add_argument("--verbose", action="store_true",
+                        help="log sound loading and game events to stdout")
+    parser.add_argument("--pacing", choices=MODES, default="sleep",
+                        help="frame pacing: OS sleep, sleep plus spin for steady timing (more CPU), "
+                             "or locked to the display refresh")
+    parser.add_argument("--telemetry", metavar="FILE", nargs="?", const=TELEMETRY_FILE,
+                        help="record gameplay events as JSON lines (default file: "
+                             "snake_game_assets/telemetry.jsonl, rotated at 1 MB)")
+    parser.add_argument("--level", choices=("random",) + levels.KINDS + ("any",), default="random",
+                        help="obstacle layout: a few random blocks, or a level from the prebuilt pack")
+    args = parser.parse_args()
+    
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        run_network_game(host or "127.0.0.1", int(port))
+    else:
+        main(args.pacing, args.telemetry, None if args.level == "random" else args.level)
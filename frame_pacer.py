@@ -0,0 +1,153 @@
+"""
+Frame pacing for the pygame games
+
+pygame.time.Clock.tick sleeps with the OS timer, which can wake up several
+milliseconds late, so frame intervals jitter. FramePacer keeps an absolute
+deadline per frame and has three modes:
+
+    sleep    coarse OS sleep only (what Clock.tick does)
+    precise  sleep until just before the deadline, then spin for the rest;
+             the sleep margin adapts to how late the OS has been waking us
+    vsync    never sleep; display.flip blocks on the monitor's refresh and
+             the game logic advances by exactly one refresh interval per frame
+
+Every mode records the measured frame intervals so jitter can be reported.
+
+Screens where nothing moves (menus, pause, game over) should not be paced at
+all: wait_for_events blocks the loop in SDL until there is input to react to.
+"""
+
+import collections
+import math
+import time
+
+MODES = ("sleep", "precise", "vsync")
+SPIN = 0.001          # Seconds always spent spinning before a deadline
+HISTORY = 600         # Frame intervals kept for jitter statistics
+DEFAULT_REFRESH = 60  # Used when the display does not report its rate
+IDLE_TIMEOUT = 500    # Longest idle wait (ms), so Ctrl+C in a terminal still gets through
+IDLE_POLL = 0.05      # Seconds between checks where SDL cannot block on input
+
+# Video drivers that can sleep on their input source (SDL 2.0.22+). Elsewhere
+# (kmsdrm, dummy, ...) SDL's own wait polls every millisecond
+BLOCKING_DRIVERS = ("x11", "wayland", "windows", "cocoa")
+
+
+def enable_vsync(size):
+    """Recreate the pygame window with vsync; returns its refresh rate or None."""
+    import pygame
+    try:
+        pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+    except pygame.error:
+        return None  # No vsync-capable renderer (e.g. software or dummy driver)
+    try:
+        rate = pygame.display.get_current_refresh_rate()
+    except (AttributeError, pygame.error):  # pygame < 2.1.3
+        rate = 0
+    return rate or DEFAULT_REFRESH
+
+
+def wait_for_events(timeout=IDLE_TIMEOUT):
+    """Sleep until an event arrives (or timeout ms pass); returns the pending events."""
+    import pygame
+    if pygame.display.get_driver() in BLOCKING_DRIVERS and pygame.get_sdl_version() >= (2, 0, 22):
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    # Waking 20 times a second is far cheaper than SDL's 1 ms poll
+    deadline = time.monotonic() + timeout / 1000.0
+    while True:
+        events = pygame.event.get()
+        if events or time.monotonic() >= deadline:
+            return events
+        time.sleep(IDLE_POLL)
+
+
+class FramePacer:
+    def __init__(self, fps, mode="precise", spin=SPIN, history=HISTORY):
+        if mode not in MODES:
+            raise ValueError(f"unknown pacing mode {mode!r}")
+        self.mode = mode
+        self.interval = 1.0 / fps
+        self.frame_ms = 1000.0 / fps
+        self.spin = spin
+        self.oversleep = 0.0  # Running estimate of how late sleep() returns
+        self.intervals = collections.deque(maxlen=history)
+        self.late_frames = 0
+        self.last = time.perf_counter()
+        self.deadline = self.last + self.interval
+
+    def wait(self):
+        now = time.perf_counter()
+        if self.mode == "vsync":
+            return now
+
+        remaining = self.deadline - now
+        if self.mode == "sleep":
+            if remaining > 0:
+                time.sleep(remaining)
+            return time.perf_counter()
+
+        # Precise: coarse sleep for most of the wait, leaving the spin window
+        # plus however late the OS tends to wake us up
+        coarse = remaining - self.spin - self.oversleep
+        if coarse > 0:
+            time.sleep(coarse)
+            woke = time.perf_counter()
+            late = max(0.0, woke - (now + coarse))
+            self.oversleep += (late - self.oversleep) * 0.1
+        while time.perf_counter() < self.deadline:
+            pass
+        return time.perf_counter()
+
+    def reset(self):
+        """Start over after the loop blocked, so the pause is not a long frame."""
+        self.last = time.perf_counter()
+        self.deadline = self.last + self.interval
+
+    def tick(self):
+        """Wait for the next frame; returns the milliseconds of game time it covers."""
+        now = self.wait()
+        elapsed = now - self.last
+        self.last = now
+        self.intervals.append(elapsed * 1000.0)
+
+        # Absolute deadlines keep the average rate exact; after a long stall
+        # start over instead of rushing frames to catch up
+        self.deadline += self.interval
+        if now - self.deadline > self.interval:
+            self.late_frames += 1
+            self.deadline = now + self.interval
+
+        # Locked to the display: logic moves one refresh per presented frame
+        if self.mode == "vsync":
+            return self.frame_ms
+        return elapsed * 1000.0
+
+    def stats(self):
+        """Mean, standard deviation, p99 and max of recent frame intervals (ms)."""
+        if not self.intervals:
+            return None
+        intervals = sorted(self.intervals)
+        mean = sum(intervals) / len(intervals)
+        variance = sum((value - mean) ** 2 for value in intervals) / len(intervals)
+        p99 = intervals[min(len(intervals) - 1, math.ceil(len(intervals) * 0.99) - 1)]
+        return {
+            "target_ms": self.frame_ms,
+            "mean_ms": mean,
+            "jitter_ms": math.sqrt(variance),
+            "p99_ms": p99,
+            "max_ms": intervals[-1],
+            "late_frames": self.late_frames,
+        }
+
+    def format_stats(self):
+        stats = self.stats()
+        if stats is None:
+            return f"{self.mode} pacing: no frames yet"
+        return (f"{self.mode} pacing: target {stats['target_ms']:.2f} ms, "
+                f"mean {stats['mean_ms']:.2f} ms, jitter {stats['jitter_ms']:.3f} ms, "
+                f"p99 {stats['p99_ms']:.2f} ms, max {stats['max_ms']:.2f} ms, "
+                f"{stats['late_frames']} late")
@@ -0,0 +1,35 @@
+"""
+Leveled logging for the games
+
+Log records are handed to a queue and written by a background thread, so a
+log call on the game loop never waits on stdout (which may be journald or a
+slow terminal). Use %-style arguments, e.g. log.debug("Score %d", score):
+when the level is disabled the call returns before anything is formatted.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+_listener = None
+
+
+def setup(name, verbose=False):
+    """Return the named logger, starting the background writer on first use."""
+    global _listener
+    root = logging.getLogger()
+    if _listener is None:
+        records = queue.SimpleQueue()
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter(FORMAT))
+        _listener = logging.handlers.QueueListener(records, handler)
+        _listener.start()
+        # Flush whatever is still queued when the game exits
+        atexit.register(_listener.stop)
+        root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(logging.DEBUG if verbose else logging.WARNING)
+    return logging.getLogger(name)
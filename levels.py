@@ -0,0 +1,385 @@
+"""
+Obstacle layouts for snake: mazes, rooms and symmetric patterns
+
+Each generator draws walls on a width x height grid; a layout is kept only
+if the area around the snake's start is clear and a flood fill from the
+start reaches every open cell, so no food can spawn in a sealed pocket.
+Walls never rely on screen wrap for connectivity, so a layout stays valid
+when wall collision is toggled.
+
+Level files have a fixed binary layout: a header (magic, version, width,
+height, level count) followed by fixed-size records, each holding the level
+kind, the seed it was built from, the spawn cell and direction, then one
+byte per cell (1 = wall, row by row). Generated layouts are cached as packs
+under snake_game_assets/levels, one per board size; a hand-made board is a
+file with a single record (see --convert).
+
+LevelPack opens a file with mmap and views the records through
+numpy.frombuffer, so nothing is read or copied up front: a wall lookup
+touches one page, opening a multi-megabyte board is instant, and worker
+processes that open the same file share one read-only copy in the page
+cache.
+
+    python levels.py --width 40 --height 30 --show 3
+    python levels.py --convert my_board.txt --out my_board.bin
+"""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to open level files
+    np = None
+
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snake_game_assets", "levels")
+KINDS = ("maze", "rooms", "symmetric")
+KIND_NAMES = KINDS + ("custom",)  # Kind codes stored in level files
+PER_KIND = 16           # Levels of each kind in a pack
+START_CLEARANCE = 3     # Open cells kept around the start in every direction
+MAX_ATTEMPTS = 200
+
+# Spawn direction codes, in the same order as snake_net.DIRECTION_CODES
+DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+RIGHT_CODE = 3
+
+PACK_MAGIC = b"SNKL"
+PACK_VERSION = 2
+PACK_HEADER = struct.Struct("<4sHHHI")   # magic, version, width, height, level count
+LEVEL_HEADER = struct.Struct("<BIHHB")   # kind, seed, spawn x, spawn y, spawn direction
+
+_packs = {}  # (width, height) -> LevelPack, opened once per process
+
+
+def start_cell(width, height):
+    """Where SnakeEngine puts the snake's head."""
+    return (width // 2, height // 2)
+
+
+def is_playable(width, height, walls, start=None, clearance=START_CLEARANCE):
+    """True if the start area is open and every open cell is reachable from it.
+
+    walls is a bytearray of width * height cells, 1 for a wall; start is the
+    spawn cell (the board center by default) and clearance how many cells
+    around it must be open.
+    """
+    sx, sy = start or start_cell(width, height)
+    for y in range(max(0, sy - clearance), min(height, sy + clearance + 1)):
+        for x in range(max(0, sx - clearance), min(width, sx + clearance + 1)):
+            if walls[y * width + x]:
+                return False
+
+    # Flood fill over flat indices; seen doubles as the visited set
+    seen = bytearray(walls)
+    start = sy * width + sx
+    seen[start] = 1
+    stack = [start]
+    reached = 1
+    while stack:
+        cell = stack.pop()
+        x = cell % width
+        for neighbor in (cell - width if cell >= width else -1,
+                         cell + width if cell + width < width * height else -1,
+                         cell - 1 if x > 0 else -1,
+                         cell + 1 if x < width - 1 else -1):
+            if neighbor >= 0 and not seen[neighbor]:
+                seen[neighbor] = 1
+                reached += 1
+                stack.append(neighbor)
+    return reached == len(walls) - sum(walls)
+
+
+def clear_start(width, height, walls):
+    sx, sy = start_cell(width, height)
+    for y in range(max(0, sy - START_CLEARANCE), min(height, sy + START_CLEARANCE + 1)):
+        for x in range(max(0, sx - START_CLEARANCE), min(width, sx + START_CLEARANCE + 1)):
+            walls[y * width + x] = 0
+
+
+def maze(width, height, rng, pitch=6, loops=0.3):
+    """A braided maze with corridors pitch - 1 cells wide."""
+    walls = bytearray(width * height)
+    cols, rows = width // pitch, height // pitch
+
+    def wall(x, y):
+        if x < width and y < height:
+            walls[y * width + x] = 1
+
+    # Every wall segment between two rooms, plus the posts where they meet
+    for j in range(rows):
+        for i in range(cols):
+            x, y = i * pitch + pitch - 1, j * pitch + pitch - 1
+            if i + 1 < cols:
+                for k in range(pitch - 1):
+                    wall(x, j * pitch + k)
+            if j + 1 < rows:
+                for k in range(pitch - 1):
+                    wall(i * pitch + k, y)
+            if i + 1 < cols and j + 1 < rows:
+                wall(x, y)
+
+    def open_between(a, b):
+        (i, j), (k, l) = a, b
+        if i != k:
+            x = min(i, k) * pitch + pitch - 1
+            for n in range(pitch - 1):
+                walls[(j * pitch + n) * width + x] = 0
+        else:
+            y = min(j, l) * pitch + pitch - 1
+            for n in range(pitch - 1):
+                walls[y * width + i * pitch + n] = 0
+
+    # Depth-first spanning tree over the rooms, then extra openings for loops
+    start = (rng.randrange(cols), rng.randrange(rows))
+    visited = {start}
+    stack = [start]
+    while stack:
+        i, j = stack[-1]
+        neighbors = [(i + di, j + dj) for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                     if 0 <= i + di < cols and 0 <= j + dj < rows and (i + di, j + dj) not in visited]
+        if not neighbors:
+            stack.pop()
+            continue
+        nxt = rng.choice(neighbors)
+        open_between((i, j), nxt)
+        visited.add(nxt)
+        stack.append(nxt)
+    for j in range(rows):
+        for i in range(cols):
+            if i + 1 < cols and rng.random() < loops:
+                open_between((i, j), (i + 1, j))
+            if j + 1 < rows and rng.random() < loops:
+                open_between((i, j), (i, j + 1))
+    return walls
+
+
+def rooms(width, height, rng, door=4):
+    """A grid of rooms split by walls, with a doorway in every wall segment."""
+    walls = bytearray(width * height)
+    cols, rows = rng.choice((2, 3)), rng.choice((2, 3))
+    xs = [width * (i + 1) // cols for i in range(cols - 1)]
+    ys = [height * (j + 1) // rows for j in range(rows - 1)]
+    x_edges = [0] + xs + [width]
+    y_edges = [0] + ys + [height]
+
+    for x in xs:
+        for j in range(rows):
+            top, bottom = y_edges[j], y_edges[j + 1]
+            gap = rng.randrange(top + 1, max(top + 2, bottom - door))
+            for y in range(top, bottom):
+                if not gap <= y < gap + door:
+                    walls[y * width + x] = 1
+    for y in ys:
+        for i in range(cols):
+            left, right = x_edges[i], x_edges[i + 1]
+            gap = rng.randrange(left + 1, max(left + 2, right - door))
+            for x in range(left, right):
+                if not gap <= x < gap + door and x not in xs:
+                    walls[y * width + x] = 1
+
+    # A pillar or two in some rooms
+    for j in range(rows):
+        for i in range(cols):
+            if rng.random() < 0.5:
+                x = rng.randrange(x_edges[i] + 3, max(x_edges[i] + 4, x_edges[i + 1] - 3))
+                y = rng.randrange(y_edges[j] + 3, max(y_edges[j] + 4, y_edges[j + 1] - 3))
+                walls[y * width + x] = 1
+    return walls
+
+
+def symmetric(width, height, rng, bars=(4, 8)):
+    """Short bars in one quarter, mirrored into the other three."""
+    walls = bytearray(width * height)
+    for _ in range(rng.randint(*bars)):
+        length = rng.randint(2, 5)
+        horizontal = rng.random() < 0.5
+        x = rng.randrange(1, width // 2 - 1)
+        y = rng.randrange(1, height // 2 - 1)
+        for k in range(length):
+            cx, cy = (x + k, y) if horizontal else (x, y + k)
+            if cx >= width // 2 or cy >= height // 2:
+                break
+            for mx, my in ((cx, cy), (width - 1 - cx, cy), (cx, height - 1 - cy),
+                           (width - 1 - cx, height - 1 - cy)):
+                walls[my * width + mx] = 1
+    return walls
+
+
+GENERATORS = {"maze": maze, "rooms": rooms, "symmetric": symmetric}
+
+
+def generate(kind, width, height, seed):
+    """A playable layout as a bytearray of cells; retries with derived seeds."""
+    for attempt in range(MAX_ATTEMPTS):
+        rng = random.Random(seed * MAX_ATTEMPTS + attempt)
+        walls = GENERATORS[kind](width, height, rng)
+        clear_start(width, height, walls)
+        if is_playable(width, height, walls):
+            return walls
+    raise ValueError(f"no playable {kind} level for {width}x{height} from seed {seed}")
+
+
+def record_dtype(width, height):
+    """NumPy view of one level record; matches LEVEL_HEADER plus the wall bytes."""
+    return np.dtype([("kind", "u1"), ("seed", "<u4"), ("spawn_x", "<u2"), ("spawn_y", "<u2"),
+                     ("direction", "u1"), ("walls", "u1", (height, width))])
+
+
+class Level:
+    """One layout: a read-only (height, width) wall array and where the snake spawns."""
+
+    def __init__(self, kind, seed, walls, start, direction):
+        self.kind = kind
+        self.seed = seed
+        self.walls = walls
+        self.height, self.width = walls.shape
+        self.start = start
+        self.direction = direction
+
+
+class LevelPack:
+    """The levels of a level file, mapped read-only rather than read."""
+
+    def __init__(self, path):
+        if np is None:
+            raise ImportError("level files need NumPy (pip install numpy)")
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < PACK_HEADER.size:
+            raise ValueError(f"{path} is too short for a level file")
+        magic, version, self.width, self.height, count = PACK_HEADER.unpack_from(self.map)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a version {PACK_VERSION} level file")
+        dtype = record_dtype(self.width, self.height)
+        if len(self.map) < PACK_HEADER.size + count * dtype.itemsize:
+            raise ValueError(f"{path} is truncated")
+        self.records = np.frombuffer(self.map, dtype=dtype, count=count, offset=PACK_HEADER.size)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        record = self.records[index]
+        return Level(KIND_NAMES[record["kind"]], int(record["seed"]), self.records["walls"][index],
+                     (int(record["spawn_x"]), int(record["spawn_y"])), DIRECTIONS[record["direction"]])
+
+    def indices(self, kind=None):
+        """Record numbers of every level of kind (all levels if None)."""
+        if kind is None:
+            return range(len(self.records))
+        return np.flatnonzero(self.records["kind"] == KIND_NAMES.index(kind)).tolist()
+
+
+def write_levels(path, width, height, levels):
+    """Write (kind, seed, walls, spawn cell, direction) tuples as a level file.
+
+    walls is anything bytes() accepts with width * height cells, row by row.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, width, height, len(levels)))
+        for kind, seed, walls, (x, y), direction in levels:
+            walls = bytes(walls)
+            if len(walls) != width * height:
+                raise ValueError(f"expected {width * height} cells, got {len(walls)}")
+            f.write(LEVEL_HEADER.pack(KIND_NAMES.index(kind), seed, x, y, DIRECTIONS.index(direction)))
+            f.write(walls)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def pack_path(width, height):
+    return os.path.join(LEVELS_DIR, f"levels_{width}x{height}.bin")
+
+
+def build_pack(width, height, per_kind=PER_KIND, path=None):
+    """Generate per_kind levels of every kind and write them as a pack."""
+    start = start_cell(width, height)
+    levels = [(kind, seed, generate(kind, width, height, seed), start, DIRECTIONS[RIGHT_CODE])
+              for kind in KINDS for seed in range(per_kind)]
+    return write_levels(path or pack_path(width, height), width, height, levels)
+
+
+def load_pack(width, height):
+    """The level pack for a board size, built on first use."""
+    key = (width, height)
+    if key not in _packs:
+        path = pack_path(width, height)
+        try:
+            _packs[key] = LevelPack(path)
+        except (OSError, ValueError):
+            _packs[key] = LevelPack(build_pack(width, height))
+    return _packs[key]
+
+
+def load_level(width, height, kind=None, rng=random):
+    """A random Level of the given kind (any kind if None) for this board size."""
+    pack = load_pack(width, height)
+    return pack[rng.choice(pack.indices(kind))]
+
+
+def parse_board(text):
+    """A text board ('#' wall, 'S' spawn, anything else open) as level file fields."""
+    rows = [line.rstrip("\n") for line in text.splitlines() if line.strip()]
+    height, width = len(rows), max(len(row) for row in rows)
+    walls = bytearray(width * height)
+    start = start_cell(width, height)
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row):
+            if char == "#":
+                walls[y * width + x] = 1
+            elif char == "S":
+                start = (x, y)
+    return width, height, walls, start
+
+
+def render(level):
+    walls = level.walls
+    return "\n".join("".join("S" if (x, y) == level.start else "#" if walls[y, x] else "."
+                             for x in range(level.width)) for y in range(level.height))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, convert and preview snake level files")
+    parser.add_argument("--width", type=int, default=40)
+    parser.add_argument("--height", type=int, default=30)
+    parser.add_argument("--per-kind", type=int, default=PER_KIND, help="levels of each kind")
+    parser.add_argument("--show", type=int, metavar="N", help="print level N of the file")
+    parser.add_argument("--convert", metavar="TEXT",
+                        help="turn a text board ('#' walls, 'S' spawn) into a level file")
+    parser.add_argument("--out", help="level file to write with --convert")
+    parser.add_argument("--open", metavar="FILE", help="time opening an existing level file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.open:
+        path = args.open
+    elif args.convert:
+        with open(args.convert) as f:
+            width, height, walls, spawn = parse_board(f.read())
+        # Hand-made boards may put walls right next to their spawn
+        if not is_playable(width, height, walls, spawn, clearance=0):
+            print("warning: some open cells cannot be reached from the spawn (or it is walled in)")
+        path = write_levels(args.out or os.path.splitext(args.convert)[0] + ".bin", width, height,
+                            [("custom", 0, walls, spawn, DIRECTIONS[RIGHT_CODE])])
+    else:
+        path = build_pack(args.width, args.height, args.per_kind)
+    written = time.perf_counter() - start
+    start = time.perf_counter()
+    pack = LevelPack(path)
+    opened = time.perf_counter() - start
+    print(f"{len(pack)} {pack.width}x{pack.height} levels written in {written:.2f}s, "
+          f"opened in {opened * 1000:.2f} ms: {path}")
+    if args.show is not None:
+        level = pack[args.show]
+        print(f"\n{level.kind}, {int(level.walls.sum())} walls")
+        print(render(level))
+
+
+if __name__ == "__main__":
+    main()
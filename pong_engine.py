@@ -0,0 +1,496 @@
+"""
+Headless Pong rules
+
+PongMatch plays one match with the rules of pong_game.py but without
+pygame, so it can be imported, tested and simulated without a window.
+PongBatch runs thousands of matches at once on NumPy arrays for training
+paddle agents and tuning the opponent AI.
+
+Ball movement is continuous: each step sweeps the ball's box along its
+velocity and resolves walls, paddles and goals at their exact time of
+impact, in order. A step can therefore cover any number of frames without
+the ball tunnelling through a paddle, and time_to_next_event() lets a
+simulation jump straight from one bounce to the next.
+"""
+
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for PongBatch
+    np = None
+
+# Constants
+WIDTH, HEIGHT = 800, 600
+PADDLE_WIDTH, PADDLE_HEIGHT = 15, 100
+BALL_SIZE = 15
+PADDLE_SPEED = 7  # Pixels per frame
+BALL_SPEED = 5    # Pixels per frame on each axis at serve
+PLAYER_X = 50
+OPPONENT_X = WIDTH - 50 - PADDLE_WIDTH
+PADDLE_START_Y = HEIGHT // 2 - PADDLE_HEIGHT // 2
+BALL_START_X = WIDTH // 2 - BALL_SIZE // 2
+BALL_START_Y = HEIGHT // 2 - BALL_SIZE // 2
+
+# How much the hit position changes the bounce angle
+REDUCTION_FACTOR = (PADDLE_HEIGHT // 2) / 5
+
+# Paddle actions
+UP, STAY, DOWN = -1, 0, 1
+
+# Events found by the sweep
+WALL, PLAYER_PADDLE, OPPONENT_PADDLE, PLAYER_GOAL, OPPONENT_GOAL = range(5)
+
+# Safety cap on bounces resolved in one step
+MAX_EVENTS = 1024
+
+# Opponent skill levels for InterceptAI:
+#   reaction - frames before the paddle starts moving after a bounce
+#   error    - standard deviation of the aim, in pixels
+#   speed    - paddle speed in pixels per frame
+SKILL_LEVELS = {
+    "easy": {"reaction": 18, "error": 45, "speed": 5},
+    "medium": {"reaction": 10, "error": 20, "speed": 6},
+    "hard": {"reaction": 4, "error": 8, "speed": 7},
+    "perfect": {"reaction": 0, "error": 0, "speed": 7},
+}
+
+# Highest y of the ball's top edge
+BALL_Y_RANGE = HEIGHT - BALL_SIZE
+
+INF = math.inf
+
+
+class Paddle:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.width = PADDLE_WIDTH
+        self.height = PADDLE_HEIGHT
+        self.speed = PADDLE_SPEED
+        self.score = 0
+
+    @property
+    def centery(self):
+        return self.y + PADDLE_HEIGHT // 2
+
+    def move(self, up=True, frames=1.0):
+        if up:
+            self.y -= self.speed * frames
+        else:
+            self.y += self.speed * frames
+
+        # Keep paddle on screen
+        if self.y < 0:
+            self.y = 0
+        if self.y + PADDLE_HEIGHT > HEIGHT:
+            self.y = HEIGHT - PADDLE_HEIGHT
+
+
+class Ball:
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.reset()
+
+    @property
+    def centery(self):
+        return self.y + BALL_SIZE // 2
+
+    def reset(self):
+        self.x = BALL_START_X
+        self.y = BALL_START_Y
+        self.dx = self.rng.choice([-BALL_SPEED, BALL_SPEED])
+        self.dy = self.rng.choice([-BALL_SPEED, BALL_SPEED])
+
+
+def sweep_axis(position, velocity, low, high):
+    """Times at which a moving point is inside the open interval (low, high)."""
+    if velocity == 0:
+        return (-INF, INF) if low < position < high else (INF, -INF)
+    t0 = (low - position) / velocity
+    t1 = (high - position) / velocity
+    return (t0, t1) if t0 < t1 else (t1, t0)
+
+
+def sweep_paddle(ball, paddle_x, paddle_y):
+    """Time of impact of the ball with a paddle, or INF if they never meet.
+
+    Works on the Minkowski sum: the ball's top-left corner hits the paddle
+    when it enters the paddle grown by the ball size. An overlap that already
+    exists (the paddle moved into the ball) counts as a hit at time 0.
+    """
+    x_entry, x_exit = sweep_axis(ball.x, ball.dx, paddle_x - BALL_SIZE, paddle_x + PADDLE_WIDTH)
+    y_entry, y_exit = sweep_axis(ball.y, ball.dy, paddle_y - BALL_SIZE, paddle_y + PADDLE_HEIGHT)
+    entry = max(x_entry, y_entry)
+    exit = min(x_exit, y_exit)
+    if entry >= exit or exit <= 0:
+        return INF
+    return max(entry, 0.0)
+
+
+def sweep_walls(ball):
+    """Time until the ball touches the top or bottom wall."""
+    if ball.dy < 0:
+        return max(-ball.y / ball.dy, 0.0)
+    if ball.dy > 0:
+        return max((HEIGHT - BALL_SIZE - ball.y) / ball.dy, 0.0)
+    return INF
+
+
+def sweep_goals(ball):
+    """Time until the ball reaches a goal line, and whose goal it is."""
+    if ball.dx < 0:
+        return max(-ball.x / ball.dx, 0.0), PLAYER_GOAL
+    if ball.dx > 0:
+        return max((WIDTH - BALL_SIZE - ball.x) / ball.dx, 0.0), OPPONENT_GOAL
+    return INF, None
+
+
+def fold_y(y):
+    """Map an unbounded ball y onto the board, reflecting off both walls."""
+    y %= 2 * BALL_Y_RANGE
+    return y if y <= BALL_Y_RANGE else 2 * BALL_Y_RANGE - y
+
+
+def intercept_y(x, y, dx, dy, contact_x):
+    """Ball y when its x reaches contact_x, including wall bounces."""
+    return fold_y(y + dy * (contact_x - x) / dx)
+
+
+class InterceptAI:
+    """Opponent that predicts where the ball will cross its paddle.
+
+    The intercept is computed analytically once per paddle hit, wall bounce
+    or serve; between those the paddle just moves towards the cached target.
+    Skill comes from the reaction delay, aiming error and paddle speed.
+    """
+
+    def __init__(self, skill="medium", rng=random):
+        settings = SKILL_LEVELS[skill] if isinstance(skill, str) else skill
+        self.reaction = settings["reaction"]
+        self.error = settings["error"]
+        self.speed = settings["speed"]
+        self.rng = rng
+        self.target = PADDLE_START_Y
+        self.wait = 0.0
+        # Ball velocity and points played when the target was computed
+        self.dx = self.dy = None
+        self.points = 0
+
+    def plan(self, match):
+        ball = match.ball
+        if ball.dx > 0:
+            y = intercept_y(ball.x, ball.y, ball.dx, ball.dy, OPPONENT_X - BALL_SIZE)
+            target = y + BALL_SIZE // 2 - PADDLE_HEIGHT // 2
+            if self.error:
+                target += self.rng.gauss(0, self.error)
+        else:
+            # Ball is going away; wait in the middle
+            target = PADDLE_START_Y
+        self.target = min(max(target, 0), HEIGHT - PADDLE_HEIGHT)
+        self.wait = self.reaction
+
+    def update(self, match, frames=1.0):
+        ball = match.ball
+        points = match.player.score + match.opponent.score
+        # Velocity only changes on a bounce and the score only on a serve
+        if ball.dx != self.dx or ball.dy != self.dy or points != self.points:
+            self.dx, self.dy, self.points = ball.dx, ball.dy, points
+            self.plan(match)
+
+        if self.wait > 0:
+            waited = min(self.wait, frames)
+            self.wait -= waited
+            frames -= waited
+
+        paddle = match.opponent
+        difference = self.target - paddle.y
+        if difference:
+            distance = min(abs(difference), self.speed * frames)
+            paddle.y += math.copysign(distance, difference)
+
+
+class PongMatch:
+    """One match: player paddle on the left, AI opponent on the right.
+
+    opponent_skill picks an InterceptAI level from SKILL_LEVELS (or a dict of
+    the same keys); None keeps the classic ball-following opponent.
+    """
+
+    def __init__(self, seed=None, opponent_skill=None):
+        self.rng = random.Random(seed)
+        self.player = Paddle(PLAYER_X, PADDLE_START_Y)
+        self.opponent = Paddle(OPPONENT_X, PADDLE_START_Y)
+        self.ball = Ball(self.rng)
+        self.opponent_brain = InterceptAI(opponent_skill, self.rng) if opponent_skill else None
+
+    def next_event(self):
+        """Return (time, event) for the next thing the ball will hit."""
+        ball = self.ball
+        time, event = sweep_walls(ball), WALL
+        # Paddles only count when the ball moves towards them
+        if ball.dx < 0:
+            hit = sweep_paddle(ball, self.player.x, self.player.y)
+            if hit <= time:
+                time, event = hit, PLAYER_PADDLE
+        elif ball.dx > 0:
+            hit = sweep_paddle(ball, self.opponent.x, self.opponent.y)
+            if hit <= time:
+                time, event = hit, OPPONENT_PADDLE
+        goal, side = sweep_goals(ball)
+        if goal < time:
+            time, event = goal, side
+        return time, event
+
+    def time_to_next_event(self):
+        """Frames until the ball next bounces or scores (paddles held still)."""
+        return self.next_event()[0]
+
+    def bounce(self, paddle):
+        ball = self.ball
+        ball.dx *= -1
+        # Adjust angle based on where the ball hits the paddle
+        difference_in_y = paddle.centery - ball.y
+        ball.dy = -difference_in_y / REDUCTION_FACTOR
+
+    def move_ball(self, frames=1.0):
+        """Sweep the ball forward, resolving every bounce in time order.
+
+        Returns 1 if the player scored, -1 if the opponent did, 0 otherwise.
+        """
+        ball = self.ball
+        remaining = frames
+        for _ in range(MAX_EVENTS):
+            time, event = self.next_event()
+            if time > remaining:
+                break
+            ball.x += ball.dx * time
+            ball.y += ball.dy * time
+            remaining -= time
+
+            if event == WALL:
+                ball.dy *= -1
+            elif event == PLAYER_PADDLE:
+                self.bounce(self.player)
+            elif event == OPPONENT_PADDLE:
+                self.bounce(self.opponent)
+            elif event == PLAYER_GOAL:
+                self.opponent.score += 1
+                ball.reset()
+                return -1
+            else:
+                self.player.score += 1
+                ball.reset()
+                return 1
+        else:
+            return 0
+
+        ball.x += ball.dx * remaining
+        ball.y += ball.dy * remaining
+        return 0
+
+    def opponent_ai(self, frames=1.0):
+        if self.opponent_brain is not None:
+            self.opponent_brain.update(self, frames)
+            return
+
+        # Simple AI for opponent; never overshoots the ball on long steps
+        if self.ball.dx > 0:
+            difference = self.ball.centery - self.opponent.centery
+            distance = min(abs(difference), self.opponent.speed * frames)
+            if difference:
+                self.opponent.move(difference < 0, distance / self.opponent.speed)
+
+    def step(self, player_action=STAY, frames=1.0):
+        """Advance the match; returns 1 if the player scored, -1 if the opponent did.
+
+        Paddles move first, then the ball is swept against their new
+        positions. frames may be fractional or large (e.g.
+        time_to_next_event()); the ball never passes through a paddle.
+        """
+        if player_action == UP:
+            self.player.move(True, frames)
+        elif player_action == DOWN:
+            self.player.move(False, frames)
+        self.opponent_ai(frames)
+        return self.move_ball(frames)
+
+
+class PongBatch:
+    """Many independent matches advanced together with NumPy.
+
+    Each attribute is an array with one entry per match. step() applies the
+    same rules as PongMatch.step to every match in a single call.
+    """
+
+    def __init__(self, count, seed=None, opponent_skill=None):
+        if np is None:
+            raise ImportError("PongBatch needs NumPy (pip install numpy)")
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+        self.player_y = np.full(count, PADDLE_START_Y, dtype=np.float64)
+        self.opponent_y = np.full(count, PADDLE_START_Y, dtype=np.float64)
+        self.player_score = np.zeros(count, dtype=np.int64)
+        self.opponent_score = np.zeros(count, dtype=np.int64)
+        self.ball_x = np.empty(count, dtype=np.float64)
+        self.ball_y = np.empty(count, dtype=np.float64)
+        self.dx = np.empty(count, dtype=np.float64)
+        self.dy = np.empty(count, dtype=np.float64)
+        self.reset_balls(np.ones(count, dtype=bool))
+
+        # InterceptAI state; skill values may be per-match arrays for tuning
+        self.opponent_skill = opponent_skill
+        if opponent_skill:
+            settings = SKILL_LEVELS[opponent_skill] if isinstance(opponent_skill, str) else opponent_skill
+            self.reaction = np.broadcast_to(np.asarray(settings["reaction"], dtype=np.float64), count)
+            self.error = np.broadcast_to(np.asarray(settings["error"], dtype=np.float64), count)
+            self.speed = np.broadcast_to(np.asarray(settings["speed"], dtype=np.float64), count)
+            self.target = np.full(count, PADDLE_START_Y, dtype=np.float64)
+            self.wait = np.zeros(count, dtype=np.float64)
+            self.signature = np.full((4, count), np.nan)
+
+    def reset_balls(self, mask):
+        n = int(mask.sum())
+        if n == 0:
+            return
+        self.ball_x[mask] = BALL_START_X
+        self.ball_y[mask] = BALL_START_Y
+        self.dx[mask] = self.rng.choice([-BALL_SPEED, BALL_SPEED], n)
+        self.dy[mask] = self.rng.choice([-BALL_SPEED, BALL_SPEED], n)
+
+    def move_paddles(self, paddle_y, distances):
+        paddle_y += distances
+        np.clip(paddle_y, 0, HEIGHT - PADDLE_HEIGHT, out=paddle_y)
+
+    def opponent_moves(self, frames):
+        # Simple AI for opponent, same as PongMatch.opponent_ai
+        difference = (self.ball_y + BALL_SIZE // 2) - (self.opponent_y + PADDLE_HEIGHT // 2)
+        distance = np.minimum(np.abs(difference), PADDLE_SPEED * frames)
+        return np.where(self.dx > 0, np.sign(difference) * distance, 0.0)
+
+    def intercept_moves(self, frames):
+        # Vector version of InterceptAI.update
+        signature = np.stack([self.dx, self.dy, self.player_score, self.opponent_score])
+        changed = np.any(signature != self.signature, axis=0)
+        if changed.any():
+            self.signature[:, changed] = signature[:, changed]
+            index = np.nonzero(changed)[0]
+            dx, dy = self.dx[index], self.dy[index]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                y = self.ball_y[index] + dy * (OPPONENT_X - BALL_SIZE - self.ball_x[index]) / dx
+            y %= 2 * BALL_Y_RANGE
+            y = np.where(y <= BALL_Y_RANGE, y, 2 * BALL_Y_RANGE - y)
+            target = y + BALL_SIZE // 2 - PADDLE_HEIGHT // 2 + self.rng.normal(0.0, 1.0, index.size) * self.error[index]
+            target = np.where(dx > 0, target, PADDLE_START_Y)
+            self.target[index] = np.clip(target, 0, HEIGHT - PADDLE_HEIGHT)
+            self.wait[index] = self.reaction[index]
+
+        waited = np.minimum(self.wait, frames)
+        self.wait -= waited
+        difference = self.target - self.opponent_y
+        distance = np.minimum(np.abs(difference), self.speed * (frames - waited))
+        return np.copysign(distance, difference)
+
+    @staticmethod
+    def sweep_axis(position, velocity, low, high):
+        # Vector version of sweep_axis(); INF/-INF stand in for "never"
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t0 = (low - position) / velocity
+            t1 = (high - position) / velocity
+        entry = np.minimum(t0, t1)
+        exit = np.maximum(t0, t1)
+        still = velocity == 0
+        inside = (low < position) & (position < high)
+        entry = np.where(still, np.where(inside, -INF, INF), entry)
+        exit = np.where(still, np.where(inside, INF, -INF), exit)
+        return entry, exit
+
+    def sweep_paddle(self, x, y, dx, dy, paddle_x, paddle_y):
+        x_entry, x_exit = self.sweep_axis(x, dx, paddle_x - BALL_SIZE, paddle_x + PADDLE_WIDTH)
+        y_entry, y_exit = self.sweep_axis(y, dy, paddle_y - BALL_SIZE, paddle_y + PADDLE_HEIGHT)
+        entry = np.maximum(x_entry, y_entry)
+        exit = np.minimum(x_exit, y_exit)
+        hit = (entry < exit) & (exit > 0)
+        return np.where(hit, np.maximum(entry, 0.0), INF)
+
+    def next_events(self, index):
+        """Time and event of the next hit for the matches in index."""
+        x, y = self.ball_x[index], self.ball_y[index]
+        dx, dy = self.dx[index], self.dy[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wall = np.where(dy < 0, -y / dy, np.where(dy > 0, (HEIGHT - BALL_SIZE - y) / dy, INF))
+            goal = np.where(dx < 0, -x / dx, np.where(dx > 0, (WIDTH - BALL_SIZE - x) / dx, INF))
+        player = np.where(dx < 0, self.sweep_paddle(x, y, dx, dy, PLAYER_X, self.player_y[index]), INF)
+        opponent = np.where(dx > 0, self.sweep_paddle(x, y, dx, dy, OPPONENT_X, self.opponent_y[index]), INF)
+
+        # Same priority as PongMatch.next_event: paddle beats wall on a tie,
+        # both beat a goal on a tie
+        times = np.stack([np.maximum(wall, 0.0), player, opponent, np.maximum(goal, 0.0)])
+        event = np.argmin(times[:3], axis=0)
+        time = times[event, np.arange(len(index))]
+        paddle_tie = (event == WALL) & (np.minimum(player, opponent) <= time)
+        event = np.where(paddle_tie, np.where(dx < 0, PLAYER_PADDLE, OPPONENT_PADDLE), event)
+        time = np.where(paddle_tie, np.minimum(player, opponent), time)
+        scoring = times[3] < time
+        event = np.where(scoring, np.where(dx < 0, PLAYER_GOAL, OPPONENT_GOAL), event)
+        time = np.where(scoring, times[3], time)
+        return time, event
+
+    def time_to_next_event(self):
+        """Frames until each ball next bounces or scores (paddles held still)."""
+        return self.next_events(np.arange(self.count))[0]
+
+    def move_balls(self, frames):
+        scored = np.zeros(self.count, dtype=np.int64)
+        remaining = np.full(self.count, float(frames))
+        index = np.arange(self.count)
+
+        for _ in range(MAX_EVENTS):
+            if index.size == 0:
+                break
+            time, event = self.next_events(index)
+            rest = remaining[index]
+            happens = time <= rest
+            step = np.where(happens, time, rest)
+            self.ball_x[index] += self.dx[index] * step
+            self.ball_y[index] += self.dy[index] * step
+            remaining[index] = rest - step
+
+            wall = index[happens & (event == WALL)]
+            self.dy[wall] *= -1
+            for paddle_event, paddle_y in ((PLAYER_PADDLE, self.player_y), (OPPONENT_PADDLE, self.opponent_y)):
+                hit = index[happens & (event == paddle_event)]
+                self.dx[hit] *= -1
+                # Adjust angle based on where the ball hits the paddle
+                difference_in_y = paddle_y[hit] + PADDLE_HEIGHT // 2 - self.ball_y[hit]
+                self.dy[hit] = -difference_in_y / REDUCTION_FACTOR
+            scored[index[happens & (event == PLAYER_GOAL)]] = -1
+            scored[index[happens & (event == OPPONENT_GOAL)]] = 1
+
+            # Matches stay in the sweep until their time is used up or a goal ends it
+            index = index[happens & (event != PLAYER_GOAL) & (event != OPPONENT_GOAL)]
+
+        self.player_score += scored == 1
+        self.opponent_score += scored == -1
+        self.reset_balls(scored != 0)
+        return scored
+
+    def step(self, player_actions=STAY, opponent_actions=None, frames=1.0):
+        """Advance every match by the same number of frames.
+
+        player_actions and opponent_actions are UP/STAY/DOWN per match (or a
+        single value for all); opponent_actions=None uses the built-in AI
+        (InterceptAI when the batch was made with an opponent_skill).
+        Returns an int array: 1 where the player scored, -1 where the
+        opponent did, 0 elsewhere.
+        """
+        self.move_paddles(self.player_y, np.broadcast_to(player_actions, self.count) * (PADDLE_SPEED * frames))
+        if opponent_actions is None and self.opponent_skill:
+            opponent_moves = self.intercept_moves(frames)
+        elif opponent_actions is None:
+            opponent_moves = self.opponent_moves(frames)
+        else:
+            opponent_moves = np.broadcast_to(opponent_actions, self.count) * (PADDLE_SPEED * frames)
+        self.move_paddles(self.opponent_y, opponent_moves)
+        return self.move_balls(frames)
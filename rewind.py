@@ -0,0 +1,154 @@
+"""
+Rewind for SnakeEngine games
+
+A RewindBuffer keeps the last `capacity` ticks of a game. Every
+`keyframe_interval` ticks it stores a full engine snapshot; for each tick in
+between it stores only what went into that tick: the clock reading and the
+turn that was applied. The engine is deterministic given those, so any
+recorded tick is rebuilt by restoring the keyframe at or before it and
+replaying at most keyframe_interval - 1 ticks. That reproduces every head
+added, tail removed and food moved, and the RNG, exactly.
+
+Memory is bounded by the tick count, not the snake length: one
+(time, turn) pair per tick plus one snapshot per keyframe.
+
+The buffer owns the engine's clock while attached. Game time stops while
+the player scrubs, so food and power-up lifespans carry on from the tick
+play resumes at.
+"""
+
+import collections
+import itertools
+
+REWIND_TICKS = 400        # Ticks kept (10 s at Extreme with a speed boost)
+KEYFRAME_INTERVAL = 25    # Ticks between full snapshots
+
+
+class RewindBuffer:
+    def __init__(self, engine, capacity=REWIND_TICKS, keyframe_interval=KEYFRAME_INTERVAL):
+        self.engine = engine
+        self.capacity = capacity
+        self.keyframe_interval = keyframe_interval
+        self.real_clock = engine.clock
+        self.offset = 0       # Real time minus game time
+        self.frozen = None    # Game time while a tick is being stepped or replayed
+        engine.use_clock(self.time)
+
+        self.keyframes = collections.deque()  # (tick, game time, snapshot), oldest first
+        self.inputs = collections.deque()     # (game time, turn or None) per tick from first_tick
+        self.first_tick = engine.tick
+        self.last_tick = engine.tick          # Newest tick recorded
+        self.force_keyframe = True
+
+    def time(self):
+        """The engine's clock: real time minus time spent scrubbing."""
+        if self.frozen is not None:
+            return self.frozen
+        return self.real_clock() - self.offset
+
+    def mark(self):
+        """Something outside step() changed the rules (walls, difficulty); keyframe it."""
+        self.force_keyframe = True
+
+    def step(self):
+        """engine.step(), recorded; resuming from a scrubbed tick drops the ticks after it."""
+        engine = self.engine
+        if engine.paused or engine.game_over:
+            return engine.step()
+        if engine.tick < self.last_tick:
+            self.truncate()
+
+        now = self.time()
+        if self.force_keyframe or engine.tick - self.keyframes[-1][0] >= self.keyframe_interval:
+            self.add_keyframe(now)
+
+        self.frozen = now
+        try:
+            events = engine.step()
+        finally:
+            self.frozen = None
+        turn = None
+        for event in events:
+            if event[0] == "turn":
+                turn = event[1]
+        self.inputs.append((now, turn))
+        self.last_tick = engine.tick
+        self.trim()
+        return events
+
+    def add_keyframe(self, now):
+        engine = self.engine
+        if not self.keyframes:
+            # Recording starts here (possibly from a restored save, mid-game)
+            self.first_tick = self.last_tick = engine.tick
+        self.frozen = now
+        try:
+            snapshot = engine.snapshot()
+        finally:
+            self.frozen = None
+        # A rule change between two ticks replaces that tick's keyframe
+        if self.keyframes and self.keyframes[-1][0] == engine.tick:
+            self.keyframes.pop()
+        self.keyframes.append((engine.tick, now, snapshot))
+        self.force_keyframe = False
+
+    def trim(self):
+        # Drop the oldest keyframe and its ticks once the next one alone covers capacity
+        while len(self.keyframes) > 1 and self.last_tick - self.keyframes[1][0] >= self.capacity:
+            self.keyframes.popleft()
+            first = self.keyframes[0][0]
+            while self.first_tick < first:
+                self.inputs.popleft()
+                self.first_tick += 1
+
+    def truncate(self):
+        # Play resumes from the tick on screen: the recorded future is gone
+        # and game time picks up where that tick left off
+        tick = self.engine.tick
+        resume_time = self.inputs[tick - self.first_tick][0]
+        while self.last_tick > tick:
+            self.inputs.pop()
+            self.last_tick -= 1
+        while self.keyframes[-1][0] > tick:
+            self.keyframes.pop()
+        self.offset = self.real_clock() - resume_time
+
+    def seek(self, tick):
+        """Rebuild the engine at a recorded tick (clamped); returns the tick reached."""
+        engine = self.engine
+        if not self.keyframes:
+            return engine.tick
+        tick = max(self.keyframes[0][0], min(tick, self.last_tick))
+        for index in range(len(self.keyframes) - 1, -1, -1):
+            if self.keyframes[index][0] <= tick:
+                break
+        keyframe_tick, keyframe_time, snapshot = self.keyframes[index]
+
+        paused = engine.paused
+        self.frozen = keyframe_time
+        try:
+            engine.restore(snapshot)
+            engine.paused = False
+            replay = itertools.islice(self.inputs, keyframe_tick - self.first_tick, tick - self.first_tick)
+            for now, turn in replay:
+                self.frozen = now
+                engine.turns.clear()
+                if turn is not None:
+                    engine.turns.append((turn, now))
+                engine.step()
+        finally:
+            self.frozen = None
+        engine.turns.clear()
+        engine.events = []
+        engine.paused = paused
+        return engine.tick
+
+    def back(self, ticks=1):
+        return self.seek(self.engine.tick - ticks)
+
+    def forward(self, ticks=1):
+        return self.seek(self.engine.tick + ticks)
+
+    def memory(self):
+        """Approximate bytes held: snapshots plus 16 bytes per recorded tick."""
+        return sum(len(snapshot) for _, _, snapshot in self.keyframes) + 16 * len(self.inputs)
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Arena mode: hundreds of AI snakes sharing one board
+
+Every cell of the board is tracked in a shared occupancy grid that stores the
+ID of the snake owning it, so head-to-body and head-to-head collisions are a
+single array lookup per head per tick no matter how many snakes are alive.
+"""
+
+import argparse
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
+# Arena settings
+ARENA_WIDTH = 200
+ARENA_HEIGHT = 150
+CELL_SIZE = 4
+NUM_SNAKES = 500
+FOOD_COUNT = 400
+TICK_RATE = 60
+RESPAWN_DELAY = 30  # Ticks a dead snake waits before re-entering the arena
+
+# Owner ID stored in the occupancy grid for a free cell
+EMPTY = 0
+
+UP, DOWN, LEFT, RIGHT = (0, -1), (0, 1), (-1, 0), (1, 0)
+DIRECTIONS = [UP, DOWN, LEFT, RIGHT]
+
+# Food types, same odds and points as the single player game
+FOOD_TYPES = [
+    (0.7, "normal", 1),
+    (0.9, "bonus", 3),
+    (1.0, "special", 2),
+]
+
+
+class OccupancyGrid:
+    """Flat board of owner IDs, one entry per cell (EMPTY when free)."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cells = array('i', [EMPTY]) * (width * height)
+
+    def index(self, position):
+        return position[1] * self.width + position[0]
+
+    def position(self, index):
+        return (index % self.width, index // self.width)
+
+    def owner(self, position):
+        return self.cells[position[1] * self.width + position[0]]
+
+    def clear(self):
+        self.cells = array('i', [EMPTY]) * (self.width * self.height)
+
+
+class ArenaSnake:
+    """AI snake following the rules of the single player Snake class.
+
+    Positions are kept as grid indices in a deque so moving is O(1) at both
+    ends; get_head_position still returns an (x, y) tuple.
+    """
+
+    def __init__(self, snake_id, grid, start, direction):
+        self.id = snake_id
+        self.grid = grid
+        self.positions = deque([grid.index(start)])
+        self.direction = direction
+        self.grow = 0
+        self.color = (random.randint(60, 255), random.randint(60, 255), random.randint(60, 255))
+        self.alive = False
+        self.respawn_timer = 0
+        self.score = 0
+        self.target = None  # Food cell the AI is heading for
+        self.ai = True
+
+    def get_head_position(self):
+        return self.grid.position(self.positions[0])
+
+    def change_direction(self, direction):
+        # Prevent 180-degree turns
+        if (direction[0] * -1, direction[1] * -1) != self.direction:
+            self.direction = direction
+
+    def grow_snake(self, amount=1):
+        self.grow += amount
+
+    def __len__(self):
+        return len(self.positions)
+
+
+class Arena:
+    """Simulation of many snakes on one board with a shared occupancy grid."""
+
+    def __init__(self, width=ARENA_WIDTH, height=ARENA_HEIGHT, num_snakes=NUM_SNAKES,
+                 food_count=FOOD_COUNT, wall_collision=False, seed=None, track_changes=False):
+        self.width = width
+        self.height = height
+        self.wall_collision = wall_collision
+        self.random = random.Random(seed)
+        self.grid = OccupancyGrid(width, height)
+        self.food = {}  # cell index -> points
+        self.food_count = food_count
+        self.tick_count = 0
+        self.snakes = []
+        self.free_ids = []  # IDs of removed snakes, handed out again first
+        # With track_changes the caller collects changes via take_changes(),
+        # otherwise they are discarded at the start of every tick
+        self.track_changes = track_changes
+        self.reset_changes()
+        for _ in range(num_snakes):
+            self.add_snake()
+        for _ in range(food_count):
+            self.spawn_food()
+
+    # --- Change tracking --------------------------------------------------
+
+    def reset_changes(self):
+        """Start a new list of per-tick changes (used for network deltas)."""
+        self.new_heads = []     # (snake id, cell index)
+        self.freed_cells = []   # cell indices that became EMPTY
+        self.food_added = []    # (cell index, points)
+        self.food_removed = []  # cell indices
+
+    def take_changes(self):
+        """Return everything that changed since the last call and start over."""
+        changes = (self.new_heads, self.freed_cells, self.food_added, self.food_removed)
+        self.reset_changes()
+        return changes
+
+    # --- Spawning ---------------------------------------------------------
+
+    def random_free_cell(self, attempts=100):
+        cells = self.grid.cells
+        size = self.width * self.height
+        for _ in range(attempts):
+            index = self.random.randrange(size)
+            if cells[index] == EMPTY and index not in self.food:
+                return index
+        return None
+
+    def add_snake(self, ai=True):
+        """Create a new snake (IDs start at 1 so 0 can mean EMPTY)."""
+        # Reusing IDs keeps them below the 16-bit limit of the wire format
+        snake_id = self.free_ids.pop() if self.free_ids else len(self.snakes) + 1
+        snake = ArenaSnake(snake_id, self.grid, (0, 0), RIGHT)
+        snake.ai = ai
+        self.snakes.append(snake)
+        self.respawn(snake)
+        return snake
+
+    def respawn(self, snake):
+        index = self.random_free_cell()
+        if index is None:
+            snake.respawn_timer = RESPAWN_DELAY
+            return False
+        snake.positions = deque([index])
+        snake.direction = self.random.choice(DIRECTIONS)
+        snake.grow = 2  # Start with three segments
+        snake.score = 0
+        snake.target = None
+        snake.alive = True
+        self.grid.cells[index] = snake.id
+        self.new_heads.append((snake.id, index))
+        return True
+
+    def spawn_food(self):
+        index = self.random_free_cell()
+        if index is None:
+            return
+        roll = self.random.random()
+        for chance, _, points in FOOD_TYPES:
+            if roll < chance:
+                self.food[index] = points
+                self.food_added.append((index, points))
+                break
+
+    # --- AI ----------------------------------------------------------------
+
+    def choose_direction(self, snake):
+        """Greedy AI: head for a target food, never into an occupied cell."""
+        width, height = self.width, self.height
+        cells = self.grid.cells
+        head = snake.positions[0]
+        hx, hy = head % width, head // width
+
+        if snake.target not in self.food:
+            # Pick a fresh target; random food keeps snakes spread out
+            snake.target = self.random.choice(list(self.food)) if self.food else None
+
+        best = None
+        best_distance = None
+        for dx, dy in DIRECTIONS:
+            if dx == -snake.direction[0] and dy == -snake.direction[1]:
+                continue
+            nx, ny = hx + dx, hy + dy
+            if self.wall_collision:
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                    continue
+            else:
+                nx %= width
+                ny %= height
+            if cells[ny * width + nx] != EMPTY:
+                continue
+            if snake.target is None:
+                distance = self.random.random()
+            else:
+                distance = abs(snake.target % width - nx) + abs(snake.target // width - ny)
+            if best is None or distance < best_distance:
+                best = (dx, dy)
+                best_distance = distance
+
+        if best is not None:
+            snake.direction = best
+
+    # --- Simulation --------------------------------------------------------
+
+    def tick(self):
+        """Advance every snake by one cell and resolve all collisions."""
+        width, height = self.width, self.height
+        cells = self.grid.cells
+        food = self.food
+        wall_collision = self.wall_collision
+        self.tick_count += 1
+        if not self.track_changes:
+            self.reset_changes()
+        new_heads = self.new_heads
+        freed_cells = self.freed_cells
+
+        moving = []
+        for snake in self.snakes:
+            if snake.alive:
+                if snake.ai:
+                    self.choose_direction(snake)
+                moving.append(snake)
+            elif snake.respawn_timer > 0:
+                snake.respawn_timer -= 1
+            else:
+                self.respawn(snake)
+
+        # Work out every new head before anything moves
+        targets = []
+        claims = {}
+        dead = []
+        for snake in moving:
+            head = snake.positions[0]
+            new_x = head % width + snake.direction[0]
+            new_y = head // width + snake.direction[1]
+            if wall_collision:
+                if new_x < 0 or new_x >= width or new_y < 0 or new_y >= height:
+                    dead.append(snake)
+                    continue
+            else:
+                new_x %= width
+                new_y %= height
+            index = new_y * width + new_x
+            # Two heads entering the same cell on one tick both die
+            claims[index] = EMPTY if index in claims else snake.id
+            targets.append((snake, index))
+
+        # Tails move out before heads move in, so following a tail is safe
+        for snake, _ in targets:
+            if snake.grow:
+                snake.grow -= 1
+            else:
+                tail = snake.positions.pop()
+                cells[tail] = EMPTY
+                freed_cells.append(tail)
+
+        for snake, index in targets:
+            if cells[index] != EMPTY or claims[index] != snake.id:
+                dead.append(snake)
+                continue
+            snake.positions.appendleft(index)
+            cells[index] = snake.id
+            new_heads.append((snake.id, index))
+            points = food.pop(index, None)
+            if points is not None:
+                self.food_removed.append(index)
+                snake.score += points
+                snake.grow_snake()
+                # Corpse food is a bonus, only regular food is replaced
+                if len(food) < self.food_count:
+                    self.spawn_food()
+
+        for snake in dead:
+            self.kill(snake)
+
+    def kill(self, snake):
+        """Remove a snake from the board and leave food where it died."""
+        cells = self.grid.cells
+        # Cells claimed since the last take_changes() (e.g. the spawn cell of
+        # a snake that dies on its first tick) have not been announced yet:
+        # withdraw them instead of freeing them, because clients apply freed
+        # cells before new heads and would keep them for good
+        unseen = ()
+        if self.track_changes:
+            unseen = {index for owner, index in self.new_heads if owner == snake.id}
+            if unseen:
+                self.new_heads[:] = [(owner, index) for owner, index in self.new_heads if owner != snake.id]
+        for i, index in enumerate(snake.positions):
+            if cells[index] == snake.id:
+                cells[index] = EMPTY
+                if index not in unseen:
+                    self.freed_cells.append(index)
+                if i % 3 == 0:
+                    self.food[index] = 1
+                    self.food_added.append((index, 1))
+        snake.positions.clear()
+        snake.alive = False
+        snake.respawn_timer = RESPAWN_DELAY
+
+    def remove_snake(self, snake):
+        """Take a snake out of the arena for good (e.g. a client left)."""
+        if snake.alive:
+            self.kill(snake)
+        self.snakes.remove(snake)
+        self.free_ids.append(snake.id)
+
+    def alive_count(self):
+        return sum(1 for snake in self.snakes if snake.alive)
+
+
+def benchmark(num_snakes=NUM_SNAKES, ticks=600, seed=1):
+    """Run the arena headless and return the achieved ticks per second."""
+    arena = Arena(num_snakes=num_snakes, seed=seed)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        arena.tick()
+    elapsed = time.perf_counter() - start
+    return ticks / elapsed
+
+
+def run_viewer(arena):
+    """Draw the arena in a pygame window at TICK_RATE ticks per second."""
+    import pygame
+
+    pygame.init()
+    screen = pygame.display.set_mode((arena.width * CELL_SIZE, arena.height * CELL_SIZE))
+    pygame.display.set_caption("Snake Arena")
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 24)
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return
+
+        arena.tick()
+
+        screen.fill((0, 0, 0))
+        for index in arena.food:
+            x, y = index % arena.width, index // arena.width
+            screen.fill((255, 0, 0), (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+        for snake in arena.snakes:
+            for index in snake.positions:
+                x, y = index % arena.width, index // arena.width
+                screen.fill(snake.color, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+
+        info = font.render(f"Snakes alive: {arena.alive_count()}  FPS: {clock.get_fps():.0f}", True, (255, 255, 255))
+        screen.blit(info, (10, 10))
+
+        pygame.display.flip()
+        clock.tick(TICK_RATE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-snake arena with AI snakes")
+    parser.add_argument("--snakes", type=int, default=NUM_SNAKES, help="number of AI snakes")
+    parser.add_argument("--walls", action="store_true", help="enable wall collision")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--bench", action="store_true", help="run headless and report ticks per second")
+    args = parser.parse_args()
+
+    if args.bench:
+        rate = benchmark(args.snakes)
+        print(f"{args.snakes} snakes: {rate:.1f} ticks/s (target {TICK_RATE})")
+        return 0 if rate >= TICK_RATE else 1
+
+    run_viewer(Arena(num_snakes=args.snakes, wall_collision=args.walls, seed=args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
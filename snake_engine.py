@@ -0,0 +1,727 @@
+"""
+Headless snake rules shared by every front-end
+
+snake_game.py, enhanced_snake_game.py, simple_snake_game.py (curses) and
+ascii_snake_game.py (raw terminal) all drive a SnakeEngine and hand it to a
+renderer from snake_renderers.py. Nothing in here draws, sleeps or reads
+input, so the rules can run unthrottled under the null renderer.
+
+The engine takes its own random.Random and a millisecond clock (see
+clocks.py), so a run is reproducible from its seed and can play in virtual
+time. snapshot() packs the whole game, RNG included, into a few kilobytes
+that restore() loads back, either to resume a run or to fork simulations
+from any state.
+"""
+
+import array
+import collections
+import itertools
+import random
+import struct
+import sys
+
+from clocks import wall_clock
+from timers import TimerWheel
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up restoring very long snakes
+    np = None
+
+# Directions
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+# Food types: (chance threshold, points, lifespan in ms or None for permanent)
+FOOD_TYPES = {
+    "normal": (0.7, 1, None),   # 70% chance
+    "bonus": (0.9, 3, 5000),    # 20% chance, 5 seconds
+    "special": (1.0, 2, 7000),  # 10% chance, 7 seconds
+}
+POWER_UP_TYPES = ("speed", "invincible", "double_score")
+POWER_UP_CHANCE = 0.02     # Chance per tick that a power-up appears
+POWER_UP_LIFESPAN = 10000  # 10 seconds
+POWER_UP_DURATION = 100    # Ticks a collected power-up lasts
+POWER_UP_FLAGS = {"speed": "speed_boost", "invincible": "invincible", "double_score": "double_score"}
+LIFESPAN_SLOT = 100        # ms per slot of the food/power-up lifespan wheel
+OBSTACLE_COUNT = (5, 10)
+INPUT_BUFFER = 3           # Turns queued ahead of the snake; later presses are dropped
+
+# Snapshot layout (little-endian): header, then the snake cells (uint32
+# y * width + x, head first), obstacle cells (uint16 x, y) and queued turns,
+# the difficulty label and the RNG's 625 state words. Food and power-up
+# times are stored as ages so a snapshot can be restored under a different
+# clock
+SNAPSHOT_MAGIC = b"SNK3"
+SNAPSHOT_HEADER = struct.Struct(
+    "<4sHHIIH"   # magic, width, height, tick, score, flags
+    "bbiiiI"     # direction, speed/invincible/double-score timers, power-up duration
+    "HHBi"       # food cell, type, age
+    "HHBiI"      # power-up cell, type, age, lifespan
+    "iIIBBd"     # high score (-1 = none), snake length, obstacles, turns, label length, gauss_next
+)
+SNAPSHOT_TURN = struct.Struct("<bbi")  # direction, age
+RNG_WORDS = struct.Struct("<625I")
+SNAPSHOT_FLAGS = ("wall_collision", "game_over", "paused", "power_ups", "food_types", "grow",
+                  "speed_boost", "invincible", "double_score", "power_up_active", "gauss_next")
+FOOD_TYPE_NAMES = list(FOOD_TYPES)
+MAX_AGE = 0x7FFFFFFF  # Ages are int32 ms; anything older has long expired anyway
+
+
+class SnakeBody:
+    """The snake's cells, head first, as packed y * width + x indices.
+
+    A ring buffer in an array('I') (4 bytes a segment, doubling when full)
+    plus a per-cell count of segments on the board, so moving is O(1) at both
+    ends and `cell in body` never scans the body. Iterating and indexing
+    still give (x, y) tuples, as the renderers expect.
+    """
+
+    def __init__(self, width, height, cells=()):
+        self.width = width
+        self.height = height
+        self.counts = array.array("H", bytes(2 * width * height))  # Segments per cell
+        self.ring = array.array("I", [0])
+        self.start = 0   # Ring slot of the head
+        self.length = 0
+        self.head = None  # Head cell as (x, y), kept so reading it costs nothing
+        for cell in cells:
+            self.append(cell)
+
+    @classmethod
+    def from_indices(cls, width, height, indices):
+        """A body from an array('I') of packed cells, head first (taken over, not copied)."""
+        body = cls(width, height)
+        body.ring = indices if len(indices) else array.array("I", [0])
+        body.length = len(indices)
+        if body.length:
+            body.head = (indices[0] % width, indices[0] // width)
+        if np is not None:
+            counts = np.bincount(np.frombuffer(indices, dtype=np.uint32), minlength=width * height)
+            body.counts = array.array("H", counts.astype(np.uint16).tobytes())
+        else:
+            counts = body.counts
+            for index in indices:
+                counts[index] += 1
+        return body
+
+    def indices(self):
+        """The packed cells, head first, as a new array('I')."""
+        ring, start, end = self.ring, self.start, self.start + self.length
+        if end <= len(ring):
+            return ring[start:end]
+        return ring[start:] + ring[:end - len(ring)]
+
+    def grow_ring(self):
+        self.ring = self.indices() + array.array("I", bytes(4 * max(1, self.length)))
+        self.start = 0
+
+    def push_head(self, cell):
+        if self.length == len(self.ring):
+            self.grow_ring()
+        self.start = (self.start - 1) % len(self.ring)
+        index = cell[1] * self.width + cell[0]
+        self.ring[self.start] = index
+        self.counts[index] += 1
+        self.length += 1
+        self.head = cell
+
+    def append(self, cell):
+        """Add a cell after the tail."""
+        if self.length == len(self.ring):
+            self.grow_ring()
+        index = cell[1] * self.width + cell[0]
+        self.ring[(self.start + self.length) % len(self.ring)] = index
+        self.counts[index] += 1
+        self.length += 1
+        if self.length == 1:
+            self.head = cell
+
+    def tail(self):
+        index = self.ring[(self.start + self.length - 1) % len(self.ring)]
+        return (index % self.width, index // self.width)
+
+    def pop(self):
+        """Remove and return the tail cell."""
+        tail = self.tail()
+        self.length -= 1
+        self.counts[tail[1] * self.width + tail[0]] -= 1
+        if not self.length:
+            self.head = None
+        return tail
+
+    def __len__(self):
+        return self.length
+
+    def __contains__(self, cell):
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height and self.counts[y * self.width + x] > 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.length))]
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("snake body index out of range")
+        index = self.ring[(self.start + i) % len(self.ring)]
+        return (index % self.width, index // self.width)
+
+    def __iter__(self):
+        width = self.width
+        for index in self.indices():
+            yield (index % width, index // width)
+
+
+def snake_cells(body):
+    """A SnakeBody's packed cells as little-endian bytes (one copy, no per-cell work)."""
+    cells = body.indices()
+    if sys.byteorder == "big":
+        cells.byteswap()
+    return cells.tobytes()
+
+
+class Snake:
+    def __init__(self, start, width, height):
+        self.positions = SnakeBody(width, height, [start])
+        self.direction = RIGHT  # Start moving right
+        self.grow = False
+        # Power-up effects; the engine's timer wheel switches them off again
+        self.speed_boost = False
+        self.invincible = False
+        self.double_score = False
+
+    def get_head_position(self):
+        return self.positions.head
+
+    def update(self, width, height, wall_collision):
+        """Move one cell; returns the cause of death or None."""
+        head = self.get_head_position()
+        x, y = self.direction
+
+        # Calculate new position
+        new_x = head[0] + x
+        new_y = head[1] + y
+
+        # Handle wall collision based on game mode
+        if wall_collision:
+            # Check if snake hits the wall
+            if new_x < 0 or new_x >= width or new_y < 0 or new_y >= height:
+                return "wall"
+            new_position = (new_x, new_y)
+        else:
+            # Wrap around the screen
+            new_position = (new_x % width, new_y % height)
+
+        # Check for collision with self (unless invincible); the body lookup
+        # is a cell count, not a scan
+        if not self.invincible and new_position != head and new_position in self.positions:
+            return "self"
+
+        self.positions.push_head(new_position)
+
+        if not self.grow:
+            self.positions.pop()
+        else:
+            self.grow = False
+
+        return None
+
+    def change_direction(self, direction):
+        # Prevent 180-degree turns
+        if (direction[0] * -1, direction[1] * -1) != self.direction:
+            self.direction = direction
+
+    def grow_snake(self):
+        self.grow = True
+
+    def apply_power_up(self, kind, active=True):
+        """Switch a power-up's effect on, or off once it runs out."""
+        setattr(self, POWER_UP_FLAGS[kind], active)
+
+
+class Food:
+    def __init__(self, width, height, rng, clock, food_types=True):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.clock = clock
+        self.food_types = food_types
+        self.position = (0, 0)
+        self.type = "normal"  # normal, bonus, or special
+        self.points = 1
+        self.spawn_time = clock()
+        self.lifespan = None  # None means permanent
+
+    def randomize_position(self, *avoid):
+        """Move to a random cell outside every container in avoid."""
+        rng = self.rng
+        self.position = (rng.randint(0, self.width - 1), rng.randint(0, self.height - 1))
+        # Make sure food doesn't appear on occupied cells
+        while any(self.position in cells for cells in avoid):
+            self.position = (rng.randint(0, self.width - 1), rng.randint(0, self.height - 1))
+
+        # Randomly determine food type
+        self.type = "normal"
+        if self.food_types:
+            roll = rng.random()
+            for food_type, (threshold, _, _) in FOOD_TYPES.items():
+                if roll < threshold:
+                    self.type = food_type
+                    break
+        _, self.points, self.lifespan = FOOD_TYPES[self.type]
+        self.spawn_time = self.clock()
+
+
+class Obstacle:
+    """Wall cells: a list, or a (height, width) array mapped from a level file.
+
+    Either way lookups go through a flat bitmap, one byte a cell: a bytearray
+    built from the list, or a view of the mapped array. Use `cell in
+    obstacles`, which costs the same for five walls or a dense maze;
+    positions lists the cells and is only built from a mapped grid when
+    something (a renderer) asks for it.
+    """
+
+    def __init__(self, width, height, rng, count=OBSTACLE_COUNT):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.count = count
+        self.grid = None
+        self.cells = bytearray(width * height)  # Flat bitmap, nonzero on walls
+        self._positions = []
+        self._packed = None  # pack() bytes, kept until the walls change
+
+    @property
+    def positions(self):
+        if self._positions is None:
+            self._positions = [(int(x), int(y)) for y, x in zip(*self.grid.nonzero())]
+        return self._positions
+
+    @positions.setter
+    def positions(self, positions):
+        width, height = self.width, self.height
+        cells = bytearray(width * height)
+        for x, y in positions:
+            if 0 <= x < width and 0 <= y < height:
+                cells[y * width + x] = 1
+        self.grid = None
+        self.cells = cells
+        self._positions = positions
+        self._packed = None
+
+    def __contains__(self, cell):
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y * self.width + x] != 0
+
+    def __len__(self):
+        if self.grid is None:
+            return len(self._positions)
+        return int(self.grid.sum())
+
+    def load(self, grid):
+        """Use a level's wall array as is (no copy)."""
+        self.grid = grid
+        self.cells = memoryview(grid.reshape(-1))
+        self._positions = None
+        self._packed = None
+
+    def pack(self):
+        """The cells as little-endian uint16 x, y pairs, for snapshots."""
+        if self._packed is None:
+            positions = self.positions
+            self._packed = struct.pack(f"<{2 * len(positions)}H", *itertools.chain.from_iterable(positions))
+        return self._packed
+
+    def unpack(self, data):
+        """Load pack() bytes; walls that are already these keep their bitmap (and mapping)."""
+        if data == self.pack():
+            return
+        it = iter(struct.unpack(f"<{len(data) // 2}H", data))
+        self.positions = list(zip(it, it))
+        self._packed = bytes(data)
+
+    def generate(self):
+        positions = []
+        rng = self.rng
+        # Create a random number of obstacles in the configured range
+        num_obstacles = rng.randint(*self.count)
+        for _ in range(num_obstacles):
+            pos = (rng.randint(2, self.width - 3), rng.randint(2, self.height - 3))
+            # Make sure obstacles aren't too close to the center where the snake starts
+            if abs(pos[0] - self.width // 2) > 3 or abs(pos[1] - self.height // 2) > 3:
+                positions.append(pos)
+        self.positions = positions
+
+
+class PowerUp:
+    def __init__(self, width, height, rng, clock, lifespan=POWER_UP_LIFESPAN):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.clock = clock
+        self.position = (0, 0)
+        self.active = False
+        self.type = None
+        self.spawn_time = 0
+        self.lifespan = lifespan
+
+    def spawn(self, *avoid):
+        """Appear on a random cell outside every container in avoid."""
+        rng = self.rng
+        self.position = (rng.randint(0, self.width - 1), rng.randint(0, self.height - 1))
+
+        # Make sure it doesn't spawn on occupied cells
+        while any(self.position in cells for cells in avoid):
+            self.position = (rng.randint(0, self.width - 1), rng.randint(0, self.height - 1))
+
+        # Choose a random power-up type
+        self.type = rng.choice(POWER_UP_TYPES)
+        self.active = True
+        self.spawn_time = self.clock()
+
+
+class SnakeEngine:
+    """One game of snake, advanced one logic tick at a time by step().
+
+    obstacles is True for a few random blocks, False for none, or a list of
+    cells. A level (levels.Level, e.g. from levels.load_level()) supplies
+    both the walls and where the snake spawns, and overrides obstacles.
+    """
+
+    def __init__(self, width, height, wall_collision=False, obstacles=True, power_ups=True,
+                 food_types=True, obstacle_count=OBSTACLE_COUNT,
+                 power_up_duration=POWER_UP_DURATION, seed=None, clock=wall_clock, level=None):
+        self.width = width
+        self.height = height
+        self.wall_collision = wall_collision
+        self.power_ups = power_ups
+        self.power_up_duration = power_up_duration
+        self.rng = random.Random(seed)
+        self.clock = clock
+
+        self.snake = Snake((width // 2, height // 2), width, height)
+        self.turns = collections.deque()  # (direction, time queued) not yet applied
+        self.obstacles = Obstacle(width, height, self.rng, obstacle_count)
+        if level is not None:
+            if (level.width, level.height) != (width, height):
+                raise ValueError(f"level is {level.width}x{level.height}, board is {width}x{height}")
+            self.obstacles.load(level.walls)
+            self.snake.positions = SnakeBody(width, height, [level.start])
+            self.snake.direction = level.direction
+        elif obstacles is True:
+            self.obstacles.generate()
+        elif obstacles:
+            self.obstacles.positions = list(obstacles)
+        # Expirations fire from timer wheels instead of being polled each
+        # tick: effects by tick, food and power-up lifespans by game ms
+        self.effect_timers = TimerWheel(0)
+        self.lifespan_timers = TimerWheel(clock(), LIFESPAN_SLOT)
+        self.power_up = PowerUp(width, height, self.rng, clock)
+        self.food = Food(width, height, self.rng, clock, food_types)
+        self.respawn_food()
+
+        self.tick = 0
+        self.events = []  # What happened during the last step()
+        self.score = 0
+        self.game_over = False
+        self.paused = False
+        self.difficulty = None   # Label shown by renderers
+        self.high_score = None   # Best score for this difficulty, if tracked
+
+    def occupied(self, *extra):
+        """Containers of cells besides obstacles that new food or power-ups must avoid.
+
+        The snake body is passed as is (its lookups are O(1)) rather than
+        copied into a set, which would cost O(length) on every spawn.
+        """
+        cells = (self.power_up.position,) if self.power_up.active else ()
+        return (self.snake.positions, cells) + extra
+
+    def respawn_food(self):
+        food = self.food
+        food.randomize_position(*self.occupied(), self.obstacles)
+        if food.lifespan:
+            self.lifespan_timers.schedule("food", food.spawn_time + food.lifespan)
+        else:
+            self.lifespan_timers.cancel("food")
+
+    def use_clock(self, clock):
+        """Read time from clock from now on (the engine, food and power-up)."""
+        self.clock = self.food.clock = self.power_up.clock = clock
+
+    def change_direction(self, direction):
+        """Queue a turn; step() applies at most one per tick, in order."""
+        # Check against the heading the snake will have once the queue is
+        # applied, so UP, LEFT between two ticks becomes two turns and not a
+        # reversal into itself
+        heading = self.turns[-1][0] if self.turns else self.snake.direction
+        if direction == heading or direction == (-heading[0], -heading[1]):
+            return
+        if len(self.turns) < INPUT_BUFFER:
+            self.turns.append((direction, self.clock()))
+
+    def apply_turn(self, events):
+        # Validate against the direction the snake actually moved in last
+        snake = self.snake
+        while self.turns:
+            direction, queued = self.turns.popleft()
+            if direction != snake.direction and direction != (-snake.direction[0], -snake.direction[1]):
+                snake.direction = direction
+                events.append(("turn", direction, self.clock() - queued))
+                return
+
+    def toggle_wall_collision(self):
+        self.wall_collision = not self.wall_collision
+
+    def update_interval(self, interval):
+        """Time between ticks given the base interval; speed boost halves it."""
+        return interval / 2 if self.snake.speed_boost else interval
+
+    def step(self):
+        """Advance one logic tick and return the events it produced.
+
+        Events are tuples: ("turn", direction, ms the turn waited in the
+        input buffer), ("eat", position, food_type, points),
+        ("power_up", position, power_up_type) and ("game_over", cause).
+        """
+        events = self.events = []
+        if self.paused or self.game_over:
+            return events
+        self.tick += 1
+        snake = self.snake
+        if self.turns:
+            self.apply_turn(events)
+
+        # Update game objects
+        cause = snake.update(self.width, self.height, self.wall_collision)
+        head = snake.get_head_position()
+        if cause is None and self.effect_timers:
+            for kind in self.effect_timers.advance(self.tick):
+                snake.apply_power_up(kind, False)
+
+        # Check if snake hit an obstacle
+        if cause is None and head in self.obstacles and not snake.invincible:
+            cause = "obstacle"
+        if cause is not None:
+            return self.end(cause)
+
+        # Check if snake ate food
+        if head == self.food.position:
+            snake.grow_snake()
+
+            # Calculate points
+            points = self.food.points
+            if snake.double_score:
+                points *= 2
+
+            self.score += points
+            events.append(("eat", head, self.food.type, points))
+
+            # Generate new food
+            self.respawn_food()
+
+        # Replace temporary food and remove the power-up once they run out
+        if self.lifespan_timers:
+            expired = self.lifespan_timers.advance(self.clock())
+            if "food" in expired:
+                self.respawn_food()
+            if "power_up" in expired:
+                self.power_up.active = False
+
+        if self.power_ups:
+            power_up = self.power_up
+            if not power_up.active and self.rng.random() < POWER_UP_CHANCE:
+                power_up.spawn(*self.occupied((self.food.position,)), self.obstacles)
+                self.lifespan_timers.schedule("power_up", power_up.spawn_time + power_up.lifespan)
+
+            # Check if snake collected a power-up
+            if power_up.active and head == power_up.position:
+                snake.apply_power_up(power_up.type)
+                self.effect_timers.schedule(power_up.type, self.tick + max(1, self.power_up_duration))
+                events.append(("power_up", head, power_up.type))
+                power_up.active = False
+                self.lifespan_timers.cancel("power_up")
+
+        return events
+
+    def snapshot(self):
+        """The full game state as bytes, for restore()."""
+        snake, food, power_up = self.snake, self.food, self.power_up
+        now = self.clock()
+        version, words, gauss_next = self.rng.getstate()
+        values = {"wall_collision": self.wall_collision, "game_over": self.game_over,
+                  "paused": self.paused, "power_ups": self.power_ups,
+                  "food_types": food.food_types, "grow": snake.grow,
+                  "speed_boost": snake.speed_boost, "invincible": snake.invincible,
+                  "double_score": snake.double_score, "power_up_active": power_up.active,
+                  "gauss_next": gauss_next is not None}
+        flags = 0
+        for bit, name in enumerate(SNAPSHOT_FLAGS):
+            if values[name]:
+                flags |= 1 << bit
+        label = (self.difficulty or "").encode()
+        obstacle_cells = self.obstacles.pack()
+
+        parts = [
+            SNAPSHOT_HEADER.pack(
+                SNAPSHOT_MAGIC, self.width, self.height, self.tick, self.score, flags,
+                snake.direction[0], snake.direction[1], self.effect_timers.remaining("speed", self.tick),
+                self.effect_timers.remaining("invincible", self.tick),
+                self.effect_timers.remaining("double_score", self.tick),
+                self.power_up_duration,
+                food.position[0], food.position[1], FOOD_TYPE_NAMES.index(food.type),
+                min(round(now - food.spawn_time), MAX_AGE),
+                power_up.position[0], power_up.position[1],
+                POWER_UP_TYPES.index(power_up.type) if power_up.type else 255,
+                min(round(now - power_up.spawn_time), MAX_AGE), power_up.lifespan,
+                -1 if self.high_score is None else self.high_score,
+                len(snake.positions), len(obstacle_cells) // 4, len(self.turns),
+                len(label), gauss_next or 0.0),
+            snake_cells(snake.positions),
+            obstacle_cells,
+        ]
+        for direction, queued in self.turns:
+            parts.append(SNAPSHOT_TURN.pack(direction[0], direction[1], min(round(now - queued), MAX_AGE)))
+        parts.append(label)
+        parts.append(RNG_WORDS.pack(*words))
+        return b"".join(parts)
+
+    def restore(self, data):
+        """Load a snapshot() taken on a board of the same size."""
+        try:
+            self.load_snapshot(data)
+        except struct.error as e:
+            raise ValueError(f"truncated snake snapshot: {e}") from None
+
+    def check_difficulty(self, difficulty):
+        """Raise ValueError if a snapshot's difficulty cannot be restored (any can here)."""
+
+    def load_snapshot(self, data):
+        # Everything is parsed and checked before the engine is touched, so a
+        # bad snapshot raises ValueError and leaves the game as it was
+        (magic, width, height, tick, score, flags,
+         dx, dy, boost_timer, invincible_timer, double_timer, power_up_duration,
+         food_x, food_y, food_type, food_age,
+         power_up_x, power_up_y, power_up_type, power_up_age, power_up_lifespan,
+         high_score, length, obstacles, turns, label_length,
+         gauss_next) = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a snake snapshot")
+        if (width, height) != (self.width, self.height):
+            raise ValueError(f"snapshot is for a {width}x{height} board, not {self.width}x{self.height}")
+        values = {name: bool(flags & (1 << bit)) for bit, name in enumerate(SNAPSHOT_FLAGS)}
+
+        def check_cell(x, y, what):
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"{what} cell {(x, y)} is off the {width}x{height} board")
+
+        if (dx, dy) not in (UP, DOWN, LEFT, RIGHT):
+            raise ValueError(f"bad snake direction {(dx, dy)}")
+        check_cell(food_x, food_y, "food")
+        check_cell(power_up_x, power_up_y, "power-up")
+        if food_type >= len(FOOD_TYPE_NAMES):
+            raise ValueError(f"bad food type {food_type}")
+        if power_up_type != 255 and power_up_type >= len(POWER_UP_TYPES):
+            raise ValueError(f"bad power-up type {power_up_type}")
+        if length < 1:
+            raise ValueError("snapshot has no snake")
+
+        offset = SNAPSHOT_HEADER.size
+        cells = array.array("I", data[offset:offset + 4 * length])
+        if len(cells) != length:
+            raise ValueError(f"truncated snake snapshot: the snake needs {4 * length} bytes")
+        if sys.byteorder == "big":
+            cells.byteswap()
+        if max(cells) >= width * height:
+            raise ValueError(f"snake cell index {max(cells)} is off the {width}x{height} board")
+        offset += 4 * length
+
+        obstacle_cells = data[offset:offset + 4 * obstacles]
+        if len(obstacle_cells) != 4 * obstacles:
+            raise ValueError(f"truncated snake snapshot: obstacles need {4 * obstacles} bytes")
+        if obstacle_cells != self.obstacles.pack():
+            it = iter(struct.unpack(f"<{2 * obstacles}H", obstacle_cells))
+            for x, y in zip(it, it):
+                check_cell(x, y, "obstacle")
+        offset += 4 * obstacles
+
+        queued = []
+        for _ in range(turns):
+            tx, ty, age = SNAPSHOT_TURN.unpack_from(data, offset)
+            offset += SNAPSHOT_TURN.size
+            if (tx, ty) not in (UP, DOWN, LEFT, RIGHT):
+                raise ValueError(f"bad queued turn {(tx, ty)}")
+            queued.append(((tx, ty), age))
+        label = data[offset:offset + label_length]
+        if len(label) != label_length:
+            raise ValueError(f"truncated snake snapshot: the label needs {label_length} bytes")
+        label = label.decode()
+        self.check_difficulty(label or None)
+        offset += label_length
+        words = RNG_WORDS.unpack_from(data, offset)
+        if words[-1] > 624:
+            raise ValueError("bad random number generator state")
+
+        # Valid: load it
+        now = self.clock()
+        self.turns.clear()
+        for direction, age in queued:
+            self.turns.append((direction, now - age))
+        self.rng.setstate((3, words, gauss_next if values["gauss_next"] else None))
+
+        self.tick = tick
+        self.score = score
+        self.events = []
+        self.wall_collision = values["wall_collision"]
+        self.game_over = values["game_over"]
+        self.paused = values["paused"]
+        self.power_ups = values["power_ups"]
+        self.power_up_duration = power_up_duration
+        self.difficulty = label or None
+        self.high_score = None if high_score < 0 else high_score
+
+        snake = self.snake
+        snake.positions = SnakeBody.from_indices(width, height, cells)
+        snake.direction = (dx, dy)
+        snake.grow = values["grow"]
+        self.effect_timers.clear(tick)
+        for kind, timer in (("speed", boost_timer), ("invincible", invincible_timer),
+                            ("double_score", double_timer)):
+            active = values[POWER_UP_FLAGS[kind]]
+            snake.apply_power_up(kind, active)
+            if active:
+                self.effect_timers.schedule(kind, tick + timer)
+
+        self.obstacles.unpack(obstacle_cells)
+
+        food = self.food
+        food.position = (food_x, food_y)
+        food.food_types = values["food_types"]
+        food.type = FOOD_TYPE_NAMES[food_type]
+        _, food.points, food.lifespan = FOOD_TYPES[food.type]
+        food.spawn_time = now - food_age
+
+        power_up = self.power_up
+        power_up.position = (power_up_x, power_up_y)
+        power_up.type = None if power_up_type == 255 else POWER_UP_TYPES[power_up_type]
+        power_up.active = values["power_up_active"]
+        power_up.spawn_time = now - power_up_age
+        power_up.lifespan = power_up_lifespan
+
+        self.lifespan_timers.clear(now)
+        if food.lifespan:
+            self.lifespan_timers.schedule("food", food.spawn_time + food.lifespan)
+        if power_up.active:
+            self.lifespan_timers.schedule("power_up", power_up.spawn_time + power_up.lifespan)
+
+    def end(self, cause):
+        self.game_over = True
+        # Update high score if needed
+        if self.high_score is not None and self.score > self.high_score:
+            self.high_score = self.score
+        self.events.append(("game_over", cause))
+        return self.events
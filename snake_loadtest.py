@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Load test for the multiplayer snake server
+
+Starts a GameServer in this process and drives it with bot clients running
+in separate worker processes, so the bots do not steal time from the server
+being measured. Each stage of the ramp uses a fresh server and reports the
+tick time distribution, broadcast fan-out cost, per-client bandwidth and
+dropped/late inputs.
+
+    python snake_loadtest.py --ramp 100,500,1000,2000 --duration 10
+    python snake_loadtest.py --json results.json
+    python snake_loadtest.py --baseline results.json   # exit 1 on regression
+    python snake_loadtest.py --check                   # join/leave consistency
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import random
+import struct
+import sys
+import time
+
+import snake_net
+from snake_server import GameServer
+
+# Load test settings
+RAMP = [50, 200, 500, 1000]
+DURATION = 10.0         # Seconds measured per stage
+TICK_RATE = 20
+CELLS_PER_SNAKE = 64    # Board area per client, so the board grows with the ramp
+WORKERS = 2
+INPUT_CHANCE = 0.2      # Chance a bot turns after each tick it receives
+CONNECT_CONCURRENCY = 200
+CONNECT_TIMEOUT = 60.0
+TOLERANCE = 0.25        # Allowed slowdown against a baseline before failing
+
+CHECK_TICKS = 5         # Ticks stepped before and after the join/leave in --check
+CHECK_ATTEMPTS = 200    # Joins tried in --check until one can die on its first tick
+
+TICK_FIELD = struct.Struct("!I")
+
+
+def raise_file_limit():
+    # Thousands of sockets need more descriptors than the usual soft limit
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+class Bot:
+    """One client connection with a random-turn policy."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.frames = snake_net.FrameReader()
+        self.tick = 0
+        self.bytes_received = 0
+        self.inputs_sent = 0
+        self.connected = False
+
+    async def run(self, host, port, connect_slots, stop):
+        async with connect_slots:
+            reader, writer = await asyncio.open_connection(host, port)
+        self.connected = True
+        try:
+            while not stop.is_set():
+                data = await reader.read(65536)
+                if not data:
+                    break
+                self.bytes_received += len(data)
+                for msg_type, payload in self.frames.feed(data):
+                    if msg_type != snake_net.MSG_DELTA:
+                        continue
+                    # Bots only need the tick number, not the board
+                    self.tick = TICK_FIELD.unpack_from(payload)[0]
+                    if self.rng.random() < INPUT_CHANCE:
+                        direction = self.rng.choice(list(snake_net.DIRECTION_CODES))
+                        writer.write(snake_net.encode_input(direction, self.tick))
+                        self.inputs_sent += 1
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.connected = False
+            writer.close()
+
+
+async def run_bots(host, port, count, seed, status, start_event, stop_event):
+    loop = asyncio.get_running_loop()
+    rng = random.Random(seed)
+    stop = asyncio.Event()
+    connect_slots = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    bots = [Bot(random.Random(rng.random())) for _ in range(count)]
+    tasks = [asyncio.create_task(bot.run(host, port, connect_slots, stop)) for bot in bots]
+
+    # Multiprocessing events are polled; they cannot be awaited
+    while not start_event.is_set():
+        await asyncio.sleep(0.05)
+    for bot in bots:
+        bot.bytes_received = 0
+    start = loop.time()
+
+    while not stop_event.is_set():
+        await asyncio.sleep(0.05)
+    elapsed = loop.time() - start
+    stop.set()
+    status.put({
+        "bytes_per_second": [bot.bytes_received / elapsed for bot in bots],
+        "inputs_sent": sum(bot.inputs_sent for bot in bots),
+        "disconnected": sum(1 for bot in bots if not bot.connected),
+    })
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def bot_worker(host, port, count, seed, status, start_event, stop_event):
+    """Entry point of a worker process running `count` bots."""
+    raise_file_limit()
+    asyncio.run(run_bots(host, port, count, seed, status, start_event, stop_event))
+
+
+async def run_stage(clients, duration, workers, tick_rate, seed):
+    side = max(40, math.ceil(math.sqrt(clients * CELLS_PER_SNAKE)))
+    server = GameServer("127.0.0.1", 0, side, side, tick_rate, food_count=clients // 4 + 5,
+                        seed=seed, backlog=min(clients, 4096))
+    await server.start()
+
+    ctx = multiprocessing.get_context("spawn")
+    status = ctx.Queue()
+    start_event = ctx.Event()
+    stop_event = ctx.Event()
+    processes = []
+    workers = max(1, min(workers, clients))
+    for i in range(workers):
+        count = clients // workers + (1 if i < clients % workers else 0)
+        process = ctx.Process(target=bot_worker, daemon=True,
+                              args=("127.0.0.1", server.port, count, seed + i,
+                                    status, start_event, stop_event))
+        process.start()
+        processes.append(process)
+
+    try:
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while len(server.clients) < clients:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"only {len(server.clients)} of {clients} bots connected")
+            await asyncio.sleep(0.1)
+
+        # Measure from here on; connection setup is not part of the numbers
+        server.reset_stats()
+        start_event.set()
+        await asyncio.sleep(duration)
+        stats = server.stats()
+        stop_event.set()
+
+        bandwidth = []
+        inputs_sent = 0
+        disconnected = 0
+        for _ in processes:
+            result = await asyncio.to_thread(status.get, True, 30)
+            bandwidth.extend(result["bytes_per_second"])
+            inputs_sent += result["inputs_sent"]
+            disconnected += result["disconnected"]
+    finally:
+        stop_event.set()
+        for process in processes:
+            await asyncio.to_thread(process.join, 10)
+            if process.is_alive():
+                process.terminate()
+        await server.stop()
+
+    # No tick finished inside the window: the server is saturated
+    stats["saturated"] = not stats
+    bandwidth.sort()
+    stats.update({
+        "clients": clients,
+        "board": f"{side}x{side}",
+        "client_bytes_per_s_mean": sum(bandwidth) / len(bandwidth) if bandwidth else 0.0,
+        "client_bytes_per_s_min": bandwidth[0] if bandwidth else 0.0,
+        "client_bytes_per_s_max": bandwidth[-1] if bandwidth else 0.0,
+        "inputs_sent": inputs_sent,
+        "bots_disconnected": disconnected,
+    })
+    return stats
+
+
+def format_stage(stats):
+    budget = 1000.0 / stats["tick_rate"]
+    if stats["saturated"]:
+        return (f"{stats['clients']:>6} clients {stats['board']:>9} | SATURATED: no tick finished "
+                f"in the measurement window (budget {budget:.0f} ms) | "
+                f"{stats['bots_disconnected']} bots disconnected")
+    return (f"{stats['clients']:>6} clients {stats['board']:>9} | "
+            f"tick p50 {stats['tick_ms_p50']:6.2f}  p90 {stats['tick_ms_p90']:6.2f}  "
+            f"p99 {stats['tick_ms_p99']:6.2f}  max {stats['tick_ms_max']:6.2f} ms "
+            f"(budget {budget:.0f}) | fan-out {stats['fanout_ms_mean']:6.2f} ms | "
+            f"{stats['client_bytes_per_s_mean'] / 1024:6.1f} KiB/s per client | "
+            f"inputs {stats['inputs_applied']} applied, {stats['inputs_dropped']} dropped, "
+            f"{stats['inputs_late']} late | overruns {stats['overruns']}")
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions against a previous --json run."""
+    previous = {stage["clients"]: stage for stage in baseline["stages"]}
+    regressions = []
+    for stage in results["stages"]:
+        old = previous.get(stage["clients"])
+        if old is None or old.get("saturated"):
+            continue
+        if stage["saturated"]:
+            regressions.append(f"{stage['clients']} clients: saturated, no tick finished")
+            continue
+        for key in ("tick_ms_p50", "tick_ms_p99", "fanout_ms_mean"):
+            if stage[key] > old[key] * (1 + tolerance):
+                regressions.append(f"{stage['clients']} clients: {key} {old[key]:.2f} -> {stage[key]:.2f}")
+    return regressions
+
+
+async def settle(server, clients):
+    # Let the server accept or drop connections until it has `clients`
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    while len(server.clients) != clients:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"server has {len(server.clients)} clients, expected {clients}")
+        await asyncio.sleep(0.01)
+
+
+def fatal_direction(arena, snake):
+    """A direction that runs snake into a cell still taken after the next
+    tick's tails move, or None if no neighbour is one."""
+    cells, width, height = arena.grid.cells, arena.width, arena.height
+    owners = {other.id: other for other in arena.snakes}
+    head = snake.positions[0]
+    for direction in snake_net.DIRECTION_CODES:
+        x = (head % width + direction[0]) % width
+        y = (head // width + direction[1]) % height
+        other = owners.get(cells[y * width + x])
+        if other is not None and other is not snake and (other.grow or other.positions[-1] != y * width + x):
+            return direction
+    return None
+
+
+async def check_join_leave(seed, ticks=CHECK_TICKS):
+    """Loopback check that an observer's board matches the server's after a
+    client joins and leaves between two ticks, and after a client joins and
+    dies on its first tick; returns the cells that differ."""
+    server = GameServer("127.0.0.1", 0, tick_rate=1, bots=20, seed=seed)
+    await server.start()
+    server.tick_task.cancel()  # Ticks are stepped by hand below
+    observer = snake_net.NetworkClient("127.0.0.1", server.port)
+    try:
+        await settle(server, 1)
+
+        async def step():
+            server.tick()
+            await asyncio.sleep(0.05)  # Let the delta reach the observer
+            observer.poll()
+
+        def mismatched():
+            expected = {index: owner for index, owner in enumerate(server.arena.grid.cells) if owner}
+            cells = set(expected) | set(observer.cells)
+            return {cell for cell in cells if expected.get(cell) != observer.cells.get(cell)}
+
+        for _ in range(ticks):
+            await step()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await settle(server, 2)
+        writer.close()
+        await writer.wait_closed()
+        await settle(server, 1)
+        for _ in range(ticks):
+            await step()
+
+        # Join, steer into another snake and die in the first tick
+        for _ in range(CHECK_ATTEMPTS):
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            await settle(server, 2)
+            snake = list(server.clients.values())[-1].snake
+            direction = fatal_direction(server.arena, snake)
+            if direction is not None:
+                writer.write(snake_net.encode_input(direction, server.arena.tick_count))
+                await asyncio.sleep(0.05)  # Let the server queue the input
+            await step()
+            died = direction is not None and not snake.alive
+            # Compare now too: a ghost cell can be taken over by a later head
+            differ = mismatched() if died else set()
+            writer.close()
+            await writer.wait_closed()
+            await settle(server, 1)
+            if died:
+                break
+        else:
+            raise RuntimeError(f"no joining snake could die on its first tick in {CHECK_ATTEMPTS} tries")
+        for _ in range(ticks):
+            await step()
+
+        return sorted(differ | mismatched())
+    finally:
+        observer.close()
+        await server.stop()
+
+
+async def run_ramp(ramp, duration, workers, tick_rate, seed):
+    stages = []
+    for clients in ramp:
+        stats = await run_stage(clients, duration, workers, tick_rate, seed)
+        stats["tick_rate"] = tick_rate
+        print(format_stage(stats), flush=True)
+        stages.append(stats)
+        if stats["saturated"]:
+            break  # Larger stages can only be worse
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the multiplayer snake server")
+    parser.add_argument("--ramp", default=",".join(map(str, RAMP)),
+                        help="comma separated client counts, one stage each")
+    parser.add_argument("--duration", type=float, default=DURATION, help="seconds measured per stage")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="bot worker processes")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="FILE", help="write the results to FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="fail if slower than a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--check", action="store_true",
+                        help="only check that a client leaving or dying right after joining leaves no ghost cells")
+    args = parser.parse_args()
+
+    if args.check:
+        mismatched = asyncio.run(check_join_leave(args.seed))
+        if mismatched:
+            print(f"FAIL {len(mismatched)} cells differ from the server: {mismatched[:10]}")
+            return 1
+        print("OK observer board matches the server")
+        return 0
+
+    raise_file_limit()
+    ramp = [int(count) for count in args.ramp.split(",") if count]
+    stages = asyncio.run(run_ramp(ramp, args.duration, args.workers, args.tick_rate, args.seed))
+    results = {"tick_rate": args.tick_rate, "duration": args.duration, "stages": stages}
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Wire protocol and client for multiplayer snake
+
+Every message is a frame: a 4 byte big-endian payload length, a 1 byte
+message type and the payload. After WELCOME and one SNAPSHOT the server only
+sends DELTA frames holding what changed during the tick: new heads, freed
+cells (removed tails and dead snakes) and food added or eaten.
+
+Cells are sent as board indices (y * width + x), packed as 16-bit values when
+the board has at most 65536 cells and 32-bit values otherwise.
+"""
+
+import socket
+import struct
+
+# Message types
+MSG_WELCOME = 1   # server -> client: your snake id and the board settings
+MSG_SNAPSHOT = 2  # server -> client: every occupied cell and every food
+MSG_DELTA = 3     # server -> client: changes made by one tick
+MSG_INPUT = 4     # client -> server: new direction
+
+HEADER = struct.Struct("!IB")
+WELCOME = struct.Struct("!HHHH")     # snake id, width, height, tick rate
+DELTA_HEADER = struct.Struct("!IHHHH")  # tick, heads, freed, food added, food removed
+INPUT = struct.Struct("!BI")         # direction code, last tick seen by the client
+
+DIRECTION_CODES = {(0, -1): 0, (0, 1): 1, (-1, 0): 2, (1, 0): 3}
+CODE_DIRECTIONS = {code: direction for direction, code in DIRECTION_CODES.items()}
+
+
+def cell_format(width, height):
+    return "H" if width * height <= 0x10000 else "I"
+
+
+def frame(msg_type, payload):
+    return HEADER.pack(len(payload), msg_type) + payload
+
+
+def encode_welcome(snake_id, width, height, tick_rate):
+    return frame(MSG_WELCOME, WELCOME.pack(snake_id, width, height, tick_rate))
+
+
+def encode_snapshot(tick, cells, food, cell_fmt):
+    """cells is a list of (cell, owner), food a list of (cell, points)."""
+    payload = [struct.pack("!III", tick, len(cells), len(food))]
+    if cells:
+        payload.append(struct.pack(f"!{len(cells)}{cell_fmt}", *(cell for cell, _ in cells)))
+        payload.append(struct.pack(f"!{len(cells)}H", *(owner for _, owner in cells)))
+    if food:
+        payload.append(struct.pack(f"!{len(food)}{cell_fmt}", *(cell for cell, _ in food)))
+        payload.append(struct.pack(f"!{len(food)}B", *(points for _, points in food)))
+    return frame(MSG_SNAPSHOT, b"".join(payload))
+
+
+def decode_snapshot(payload, cell_fmt):
+    tick, num_cells, num_food = struct.unpack_from("!III", payload)
+    offset = 12
+    cells = struct.unpack_from(f"!{num_cells}{cell_fmt}", payload, offset)
+    offset += struct.calcsize(f"!{num_cells}{cell_fmt}")
+    owners = struct.unpack_from(f"!{num_cells}H", payload, offset)
+    offset += 2 * num_cells
+    food_cells = struct.unpack_from(f"!{num_food}{cell_fmt}", payload, offset)
+    offset += struct.calcsize(f"!{num_food}{cell_fmt}")
+    points = struct.unpack_from(f"!{num_food}B", payload, offset)
+    return tick, dict(zip(cells, owners)), dict(zip(food_cells, points))
+
+
+def encode_delta(tick, new_heads, freed_cells, food_added, food_removed, cell_fmt):
+    payload = [DELTA_HEADER.pack(tick, len(new_heads), len(freed_cells),
+                                 len(food_added), len(food_removed))]
+    if new_heads:
+        payload.append(struct.pack(f"!{len(new_heads)}H", *(owner for owner, _ in new_heads)))
+        payload.append(struct.pack(f"!{len(new_heads)}{cell_fmt}", *(cell for _, cell in new_heads)))
+    if freed_cells:
+        payload.append(struct.pack(f"!{len(freed_cells)}{cell_fmt}", *freed_cells))
+    if food_added:
+        payload.append(struct.pack(f"!{len(food_added)}{cell_fmt}", *(cell for cell, _ in food_added)))
+        payload.append(struct.pack(f"!{len(food_added)}B", *(points for _, points in food_added)))
+    if food_removed:
+        payload.append(struct.pack(f"!{len(food_removed)}{cell_fmt}", *food_removed))
+    return frame(MSG_DELTA, b"".join(payload))
+
+
+def decode_delta(payload, cell_fmt):
+    tick, num_heads, num_freed, num_added, num_removed = DELTA_HEADER.unpack_from(payload)
+    offset = DELTA_HEADER.size
+    cell_size = struct.calcsize(cell_fmt)
+
+    owners = struct.unpack_from(f"!{num_heads}H", payload, offset)
+    offset += 2 * num_heads
+    head_cells = struct.unpack_from(f"!{num_heads}{cell_fmt}", payload, offset)
+    offset += cell_size * num_heads
+    freed_cells = struct.unpack_from(f"!{num_freed}{cell_fmt}", payload, offset)
+    offset += cell_size * num_freed
+    added_cells = struct.unpack_from(f"!{num_added}{cell_fmt}", payload, offset)
+    offset += cell_size * num_added
+    added_points = struct.unpack_from(f"!{num_added}B", payload, offset)
+    offset += num_added
+    removed_cells = struct.unpack_from(f"!{num_removed}{cell_fmt}", payload, offset)
+
+    return (tick, list(zip(owners, head_cells)), freed_cells,
+            list(zip(added_cells, added_points)), removed_cells)
+
+
+def encode_input(direction, tick):
+    return frame(MSG_INPUT, INPUT.pack(DIRECTION_CODES[direction], tick))
+
+
+class FrameReader:
+    """Splits a byte stream into (type, payload) frames.
+
+    With max_length, feed() raises ValueError as soon as a header declares a
+    longer payload, so a peer cannot make the reader buffer without limit.
+    """
+
+    def __init__(self, max_length=None):
+        self.buffer = bytearray()
+        self.max_length = max_length
+
+    def feed(self, data):
+        self.buffer += data
+        frames = []
+        while len(self.buffer) >= HEADER.size:
+            length, msg_type = HEADER.unpack_from(self.buffer)
+            if self.max_length is not None and length > self.max_length:
+                raise ValueError(f"frame of {length} bytes exceeds {self.max_length}")
+            end = HEADER.size + length
+            if len(self.buffer) < end:
+                break
+            frames.append((msg_type, bytes(self.buffer[HEADER.size:end])))
+            del self.buffer[:end]
+        return frames
+
+
+class NetworkClient:
+    """Non-blocking client that mirrors the server board.
+
+    Call poll() once per frame; it never blocks the game loop. The board is
+    kept as cells (index -> owner id) and food (index -> points).
+    """
+
+    def __init__(self, host, port, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setblocking(False)
+        self.reader = FrameReader()
+        self.snake_id = None
+        self.width = self.height = self.tick_rate = None
+        self.cell_fmt = "I"
+        self.tick = 0
+        self.cells = {}
+        self.food = {}
+        self.connected = True
+
+        # Stats
+        self.bytes_received = 0
+        self.deltas_received = 0
+
+    def send_direction(self, direction):
+        try:
+            self.sock.send(encode_input(direction, self.tick))
+        except (BlockingIOError, InterruptedError):
+            pass  # Kernel buffer full; the next key press will be sent instead
+        except OSError:
+            self.connected = False
+
+    def poll(self):
+        """Read and apply everything the server has sent so far."""
+        while self.connected:
+            try:
+                data = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                self.connected = False
+                break
+            if not data:
+                self.connected = False
+                break
+            self.bytes_received += len(data)
+            for msg_type, payload in self.reader.feed(data):
+                self.handle(msg_type, payload)
+
+    def handle(self, msg_type, payload):
+        if msg_type == MSG_WELCOME:
+            self.snake_id, self.width, self.height, self.tick_rate = WELCOME.unpack(payload)
+            self.cell_fmt = cell_format(self.width, self.height)
+        elif msg_type == MSG_SNAPSHOT:
+            self.tick, self.cells, self.food = decode_snapshot(payload, self.cell_fmt)
+        elif msg_type == MSG_DELTA:
+            self.apply_delta(*decode_delta(payload, self.cell_fmt))
+
+    def apply_delta(self, tick, new_heads, freed_cells, food_added, food_removed):
+        cells = self.cells
+        for cell in freed_cells:
+            cells.pop(cell, None)
+        for owner, cell in new_heads:
+            cells[cell] = owner
+        for cell in food_removed:
+            self.food.pop(cell, None)
+        for cell, points in food_added:
+            self.food[cell] = points
+        self.tick = tick
+        self.deltas_received += 1
+
+    def bytes_per_tick(self):
+        return self.bytes_received / self.deltas_received if self.deltas_received else 0.0
+
+    def close(self):
+        self.connected = False
+        self.sock.close()
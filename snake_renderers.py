@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Renderer backends for the shared snake engine
+
+A renderer presents a SnakeEngine on one kind of output: a pygame window,
+a curses screen, a raw ANSI terminal, or nothing at all. The null renderer
+lets the rules run unthrottled for benchmarks and simulations:
+
+    python snake_renderers.py --renderer null --ticks 200000
+    python snake_renderers.py --renderer ansi --rate 15
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from clocks import RealClock, ScaledClock, VirtualClock
+from snake_engine import DOWN, LEFT, RIGHT, UP, SnakeEngine
+
+try:
+    import curses
+except ImportError:  # Windows Python ships without curses
+    curses = None
+
+# pygame is only imported by PygameRenderer, so the terminal games run without it
+pygame = None
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+YELLOW = (255, 255, 0)
+PURPLE = (128, 0, 128)
+ORANGE = (255, 165, 0)
+GRID_GRAY = (40, 40, 40)
+OBSTACLE_GRAY = (100, 100, 100)
+
+TICK_MS = 125  # Game time per tick in headless runs (Easy speed)
+
+SNAKE_COLORS = {"Easy": GREEN, "Medium": BLUE, "Hard": RED, "Extreme": YELLOW}
+FOOD_COLORS = {"normal": RED, "bonus": ORANGE, "special": PURPLE}
+POWER_UP_COLORS = {"speed": YELLOW, "invincible": WHITE, "double_score": PURPLE}
+POWER_UP_LABELS = (("speed_boost", "Speed Boost", YELLOW), ("invincible", "Invincible", WHITE),
+                   ("double_score", "Double Score", PURPLE))
+
+
+def active_power_ups(snake):
+    return [label for attribute, label, _ in POWER_UP_LABELS if getattr(snake, attribute)]
+
+
+class Renderer:
+    """Presents a SnakeEngine on one output device."""
+
+    def draw(self, game):
+        """Draw and present a frame; returns False if the output was already current."""
+        raise NotImplementedError
+
+    def invalidate(self):
+        """Forget what is on the output so the next draw presents a full frame."""
+
+    def pump(self):
+        """Keep the output responsive when the caller does not read input itself."""
+
+    def close(self):
+        pass
+
+
+class NullRenderer(Renderer):
+    """Draws nothing; used to run the rules as fast as they go."""
+
+    def __init__(self):
+        self.frames = 0
+
+    def draw(self, game):
+        self.frames += 1
+        return True
+
+
+class AnsiRenderer(Renderer):
+    """Plain characters on a VT100-compatible terminal, one write per frame."""
+
+    SNAKE_HEAD = 'O'
+    SNAKE_BODY = 'o'
+    FOOD = {"normal": '*', "bonus": '$', "special": '@'}
+    POWERUP = 'P'
+    OBSTACLE = 'X'
+    EMPTY = ' '
+    BORDER = '#'
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self.last_frame = None
+
+    def frame(self, game):
+        # Create empty board
+        board = [[self.EMPTY] * game.width for _ in range(game.height)]
+
+        # Add obstacles, food, power-up and snake
+        for x, y in game.obstacles.positions:
+            board[y][x] = self.OBSTACLE
+        x, y = game.food.position
+        board[y][x] = self.FOOD[game.food.type]
+        if game.power_up.active:
+            x, y = game.power_up.position
+            board[y][x] = self.POWERUP
+        for x, y in game.snake.positions:
+            board[y][x] = self.SNAKE_BODY
+        x, y = game.snake.get_head_position()
+        board[y][x] = self.SNAKE_HEAD
+
+        lines = [self.BORDER * (game.width + 2)]
+        lines.extend(self.BORDER + ''.join(row) + self.BORDER for row in board)
+        lines.append(self.BORDER * (game.width + 2))
+
+        # Game information
+        high_score = f"  High Score: {game.high_score}" if game.high_score is not None else ""
+        lines.append(f"Score: {game.score}{high_score}")
+        lines.append(f"Difficulty: {game.difficulty}  {'Wall Collision' if game.wall_collision else 'Screen Wrap'}")
+        power_ups = active_power_ups(game.snake)
+        lines.append("Active Power-ups: " + ", ".join(power_ups) if power_ups else "")
+        if game.game_over:
+            lines.append("GAME OVER")
+        elif game.paused:
+            lines.append("GAME PAUSED - Press P to continue")
+        return lines
+
+    def draw(self, game):
+        lines = self.frame(game)
+        if lines == self.last_frame:
+            return False
+        if self.last_frame is None:
+            self.out.write("\x1b[?25l\x1b[2J")  # Hide the cursor and clear once
+        self.last_frame = lines
+
+        # Home the cursor and overwrite in place, clearing each line's tail,
+        # instead of clearing the screen and scrolling every frame
+        self.out.write("\x1b[H" + "\x1b[K\n".join(lines) + "\x1b[K\x1b[J")
+        self.out.flush()
+        return True
+
+    def invalidate(self):
+        self.last_frame = None
+
+    def close(self):
+        self.out.write("\x1b[?25h")
+        self.out.flush()
+
+
+class CursesRenderer(Renderer):
+    """Characters in a curses window, the board framed at the top left."""
+
+    SNAKE_CHAR = '#'
+    FOOD = {"normal": '*', "bonus": 'B', "special": 'S'}
+    OBSTACLE_CHAR = 'X'
+    POWERUP_CHAR = 'P'
+
+    def __init__(self, stdscr, controls=None, game_over_hints=("Press R to Restart", "Press Q to Quit")):
+        self.stdscr = stdscr
+        self.controls = controls
+        self.game_over_hints = game_over_hints
+
+        # Set up colors if terminal supports them
+        try:
+            curses.start_color()
+            curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)  # Snake
+            curses.init_pair(2, curses.COLOR_RED, curses.COLOR_BLACK)    # Food
+            curses.init_pair(3, curses.COLOR_YELLOW, curses.COLOR_BLACK) # PowerUp
+            curses.init_pair(4, curses.COLOR_WHITE, curses.COLOR_BLACK)  # Text
+            curses.init_pair(5, curses.COLOR_BLUE, curses.COLOR_BLACK)   # Obstacle
+            self.colors = [curses.color_pair(i) for i in range(6)]
+        except curses.error:
+            self.colors = [0] * 6
+        self.head_attr = self.colors[1] | curses.A_BOLD if self.colors[1] else 0
+
+    def draw(self, game):
+        scr = self.stdscr
+        width, height = game.width, game.height
+        # erase() only marks the window blank; curses sends just the changed
+        # cells on refresh, where clear() would repaint the whole terminal
+        scr.erase()
+
+        # Draw border
+        edge = "-" * (width + 2)
+        scr.addstr(0, 0, edge)
+        scr.addstr(height + 1, 0, edge)
+        for i in range(height + 2):
+            scr.addstr(i, 0, "|")
+            scr.addstr(i, width + 1, "|")
+
+        # Draw obstacles, food and power-up
+        for x, y in game.obstacles.positions:
+            scr.addstr(y + 1, x + 1, self.OBSTACLE_CHAR, self.colors[5])
+        x, y = game.food.position
+        scr.addstr(y + 1, x + 1, self.FOOD[game.food.type], self.colors[2])
+        if game.power_up.active:
+            x, y = game.power_up.position
+            scr.addstr(y + 1, x + 1, self.POWERUP_CHAR, self.colors[3])
+
+        # Draw snake; head is brighter
+        for x, y in game.snake.positions:
+            scr.addstr(y + 1, x + 1, self.SNAKE_CHAR, self.colors[1])
+        x, y = game.snake.get_head_position()
+        scr.addstr(y + 1, x + 1, self.SNAKE_CHAR, self.head_attr)
+
+        # Draw score and info
+        scr.addstr(height + 3, 1, f"Score: {game.score}")
+        if game.high_score is not None:
+            scr.addstr(height + 4, 1, f"High Score: {game.high_score}")
+        scr.addstr(height + 3, width // 2, f"Difficulty: {game.difficulty}")
+        scr.addstr(height + 4, width // 2, f"{'Wall Collision' if game.wall_collision else 'Screen Wrap'}")
+
+        # Draw active power-ups
+        for i, label in enumerate(active_power_ups(game.snake)):
+            scr.addstr(height + 5 + i, 1, label + "!")
+
+        # Draw game over or pause message
+        if game.game_over:
+            lines = ("GAME OVER",) + self.game_over_hints
+        elif game.paused:
+            lines = ("PAUSED", "Press P to Continue")
+        else:
+            lines = ()
+        for i, text in enumerate(lines):
+            scr.addstr(height // 2 + i, max(0, width // 2 - len(text) // 2), text)
+
+        # Draw controls
+        if self.controls:
+            scr.addstr(height + 7, 1, self.controls)
+
+        scr.refresh()
+        return True
+
+
+class Particle:
+    def __init__(self, x, y, color):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.size = random.randint(2, 5)
+        self.life = 30
+        self.vx = random.uniform(-1, 1)
+        self.vy = random.uniform(-1, 1)
+
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+        self.life -= 1
+        self.size = max(0, self.size - 0.1)
+
+
+class PygameRenderer(Renderer):
+    """The pygame window: atlas-drawn cells, particles, HUD and overlays."""
+
+    def __init__(self, screen, cell_size=20, snake_colors=SNAKE_COLORS,
+                 game_over_hints=("Press R to Restart", "Press M for Menu"),
+                 paused_hints=("Press P to Continue",)):
+        global pygame
+        import pygame
+        from tile_atlas import PulseFrames, TileAtlas, cell_pixels, pulse_frame
+
+        self.screen = screen
+        self.cell_size = cell_size
+        self.snake_colors = snake_colors
+        self.pulse_frame = pulse_frame
+        width, height = screen.get_size()
+        self.width, self.height = width, height
+
+        # Font for text display
+        self.font = pygame.font.Font(None, 36)
+        self.large_font = pygame.font.Font(None, 72)
+        self.small_font = pygame.font.Font(None, 24)
+
+        # Every cell style is rendered once; each layer is drawn with one Surface.blits
+        self.atlas = TileAtlas(cell_size, list(snake_colors.values()) +
+                               [WHITE, YELLOW, PURPLE, OBSTACLE_GRAY] + list(FOOD_COLORS.values()))
+        self.cell_pixels = cell_pixels(width // cell_size, height // cell_size, cell_size)
+
+        # Pulse animations for special foods and power-ups, one strip per type
+        self.food_pulse = {food_type: PulseFrames(cell_size, color, 0.8)
+                           for food_type, color in FOOD_COLORS.items() if food_type != "normal"}
+        self.power_up_pulse = {kind: PulseFrames(cell_size, color, 0.7)
+                               for kind, color in POWER_UP_COLORS.items()}
+
+        # The background grid never changes
+        self.background = pygame.Surface((width, height)).convert()
+        self.background.fill(BLACK)
+        for x in range(0, width, cell_size):
+            pygame.draw.line(self.background, GRID_GRAY, (x, 0), (x, height))
+        for y in range(0, height, cell_size):
+            pygame.draw.line(self.background, GRID_GRAY, (0, y), (width, y))
+
+        # Pause and game-over overlays are rendered once and reused
+        self.dim_overlay = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+        self.dim_overlay.fill((0, 0, 0, 128))  # Semi-transparent black
+        self.game_over_text = self.centered_text(
+            [(self.large_font, "GAME OVER", RED, height // 2 - 80)] +
+            [(self.font, hint, WHITE, height // 2 + 40 * i) for i, hint in enumerate(game_over_hints)])
+        self.paused_text = self.centered_text(
+            [(self.large_font, "PAUSED", WHITE, height // 2 - 50)] +
+            [(self.font, hint, WHITE, height // 2 + 20 + 40 * i) for i, hint in enumerate(paused_hints)])
+
+        self.particles = []
+        self.game = None
+        self.seen_tick = None
+        self.obstacle_source = None
+        self.obstacle_blits = []
+        self.drawn_overlay = None  # What the paused/game-over frame on screen shows
+
+    def centered_text(self, lines):
+        """Render (font, text, color, y) lines once into a list for Surface.blits."""
+        blits = []
+        for text_font, text, color, y in lines:
+            surface = text_font.render(text, True, color)
+            blits.append((surface, (self.width // 2 - surface.get_width() // 2, y)))
+        return blits
+
+    def overlay_state(self, game):
+        # Everything a paused or game-over frame shows that input can still change
+        # (the tick moves when a rewind is scrubbed)
+        if game.game_over or game.paused:
+            return (game, game.tick, game.game_over, game.paused, game.difficulty, game.wall_collision)
+        return None
+
+    def invalidate(self):
+        self.drawn_overlay = None
+
+    def pump(self):
+        pygame.event.pump()
+
+    def create_particles(self, position, color):
+        # Create explosion effect
+        x, y = self.cell_pixels[position]
+        half = self.cell_size // 2
+        for _ in range(20):
+            self.particles.append(Particle(x + half, y + half, color))
+
+    def update_particles(self, game):
+        if game is not self.game:
+            self.game = game
+            self.particles = []
+            self.seen_tick = game.tick
+
+        # Burst on whatever the last tick ate or collected
+        if game.tick != self.seen_tick:
+            self.seen_tick = game.tick
+            for event in game.events:
+                if event[0] == "eat":
+                    self.create_particles(event[1], FOOD_COLORS[event[2]])
+                elif event[0] == "power_up":
+                    self.create_particles(event[1], WHITE)
+
+        # Particles move every frame, but freeze with the game
+        if not (game.paused or game.game_over):
+            self.particles = [p for p in self.particles if p.life > 0]
+            for particle in self.particles:
+                particle.update()
+
+    def draw(self, game):
+        # Paused and game-over screens are still pictures: the composited
+        # frame stays on screen until something under it changes
+        state = self.overlay_state(game)
+        if state is not None and state == self.drawn_overlay:
+            return False
+        self.drawn_overlay = state
+
+        self.update_particles(game)
+        screen = self.screen
+        screen.blit(self.background, (0, 0))
+
+        # Draw game elements; every pulsing cell shares one animation clock
+        now = game.clock()
+        frame = self.pulse_frame(now)
+        self.draw_obstacles(game.obstacles)
+        self.draw_food(game.food, frame)
+        if game.power_up.active:
+            pulse = self.power_up_pulse[game.power_up.type]
+            screen.blit(pulse.sheet, self.cell_pixels[game.power_up.position], pulse.areas[frame])
+        self.draw_snake(game.snake, self.snake_colors[game.difficulty], now)
+
+        # Draw particles
+        for particle in self.particles:
+            pygame.draw.circle(screen, particle.color, (int(particle.x), int(particle.y)), int(particle.size))
+
+        self.draw_hud(game)
+
+        # Draw game over message or pause overlay
+        if game.game_over:
+            screen.blit(self.dim_overlay, (0, 0))
+            screen.blits(self.game_over_text, doreturn=False)
+        elif game.paused:
+            screen.blit(self.dim_overlay, (0, 0))
+            screen.blits(self.paused_text, doreturn=False)
+
+        pygame.display.flip()
+        return True
+
+    def draw_obstacles(self, obstacles):
+        # Obstacles never move, so their blit list is rebuilt only for a new layout
+        if obstacles.positions is not self.obstacle_source:
+            self.obstacle_source = obstacles.positions
+            area = self.atlas.areas[OBSTACLE_GRAY]
+            self.obstacle_blits = [(self.atlas.sheet, self.cell_pixels[position], area)
+                                   for position in obstacles.positions]
+        self.screen.blits(self.obstacle_blits, doreturn=False)
+
+    def draw_food(self, food, frame):
+        # Pulsating effect for special foods
+        if food.type != "normal":
+            pulse = self.food_pulse[food.type]
+            self.screen.blit(pulse.sheet, self.cell_pixels[food.position], pulse.areas[frame])
+        else:
+            self.screen.blit(self.atlas.sheet, self.cell_pixels[food.position], self.atlas.areas[RED])
+
+    def draw_snake(self, snake, color, now):
+        sheet = self.atlas.sheet
+        areas = self.atlas.areas
+        pixels = self.cell_pixels
+        body = areas[color]
+        blits = [(sheet, pixels[position], body) for position in snake.positions]
+
+        # Special effects for power-ups on the first few segments
+        if snake.speed_boost or snake.double_score:
+            effect = areas[YELLOW if snake.speed_boost else PURPLE]
+            for i in range(1, min(3, len(blits))):
+                blits[i] = (sheet, blits[i][1], effect)
+
+        # Flashing head for invincibility
+        if snake.invincible and now % 200 < 100:
+            blits[0] = (sheet, blits[0][1], areas[WHITE])
+
+        self.screen.blits(blits, doreturn=False)
+
+    def draw_hud(self, game):
+        screen = self.screen
+        width = self.width
+
+        # Draw score and high score
+        score_text = self.font.render(f"Score: {game.score}", True, WHITE)
+        screen.blit(score_text, (10, 10))
+        if game.high_score is not None:
+            high_score_text = self.font.render(f"High Score: {game.high_score}", True, WHITE)
+            screen.blit(high_score_text, (10, 50))
+
+        # Draw difficulty
+        diff_text = self.font.render(f"Difficulty: {game.difficulty}", True, self.snake_colors[game.difficulty])
+        screen.blit(diff_text, (width - diff_text.get_width() - 10, 10))
+
+        # Draw wall mode
+        wall_text = self.small_font.render(
+            f"{'Wall Collision' if game.wall_collision else 'Screen Wrap'}", True, WHITE)
+        screen.blit(wall_text, (width - wall_text.get_width() - 10, 50))
+
+        # Draw active power-ups
+        power_up_y = 80
+        for attribute, label, color in POWER_UP_LABELS:
+            if getattr(game.snake, attribute):
+                text = self.small_font.render(label + "!", True, color)
+                screen.blit(text, (width - text.get_width() - 10, power_up_y))
+                power_up_y += 25
+
+
+def autopilot(game):
+    """Turn toward the food, avoiding moves that end the game next tick."""
+    snake = game.snake
+    head_x, head_y = snake.get_head_position()
+    food_x, food_y = game.food.position
+    # O(1) lookups, so no per-tick copy of a long snake. The tail counts too:
+    # the engine checks the body before the tail moves on
+    body = snake.positions
+    obstacles = game.obstacles
+
+    best = None
+    for direction in (UP, DOWN, LEFT, RIGHT):
+        if direction == (-snake.direction[0], -snake.direction[1]):
+            continue
+        x, y = head_x + direction[0], head_y + direction[1]
+        if game.wall_collision:
+            if not (0 <= x < game.width and 0 <= y < game.height):
+                continue
+        else:
+            x, y = x % game.width, y % game.height
+        if ((x, y) in body or (x, y) in obstacles) and not snake.invincible:
+            continue
+        dx = abs(x - food_x)
+        dy = abs(y - food_y)
+        if not game.wall_collision:
+            dx = min(dx, game.width - dx)
+            dy = min(dy, game.height - dy)
+        if best is None or dx + dy < best[0]:
+            best = (dx + dy, direction)
+    if best is not None:
+        game.change_direction(best[1])
+
+
+def run(renderer, ticks, rate=0, seed=None, width=40, height=30, clock=None):
+    """Play autopilot games back to back; returns (ticks, games, seconds).
+
+    Each tick advances clock by one tick interval. The default VirtualClock
+    makes food and power-ups last as many ticks as in a real game at Easy
+    speed, however fast the games are actually played.
+    """
+    clock = clock or VirtualClock()
+    rng = random.Random(seed)
+    games = 0
+    done = 0
+    start = time.perf_counter()
+    interval = 1.0 / rate if rate else 0.0
+    while done < ticks:
+        game = SnakeEngine(width, height, seed=rng.random(), clock=clock)
+        game.difficulty = "Easy"
+        games += 1
+        while not game.game_over and done < ticks:
+            autopilot(game)
+            clock.advance(game.update_interval(TICK_MS))
+            game.step()
+            renderer.draw(game)
+            renderer.pump()
+            done += 1
+            if interval:
+                time.sleep(interval)
+    return done, games, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the snake engine under any renderer")
+    parser.add_argument("--renderer", choices=["null", "ansi", "curses", "pygame"], default="null")
+    parser.add_argument("--ticks", type=int, default=100000)
+    parser.add_argument("--rate", type=float, default=0, help="ticks per second (0 = unthrottled)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--width", type=int, default=40)
+    parser.add_argument("--height", type=int, default=30)
+    parser.add_argument("--clock", choices=["virtual", "real", "scaled"], default="virtual",
+                        help=f"game time: {TICK_MS} ms per tick, wall time, or wall time x --time-scale")
+    parser.add_argument("--time-scale", type=float, default=1000.0)
+    args = parser.parse_args()
+    if args.clock == "real":
+        clock = RealClock()
+    elif args.clock == "scaled":
+        clock = ScaledClock(args.time_scale)
+    else:
+        clock = VirtualClock()
+
+    def play(renderer):
+        try:
+            return run(renderer, args.ticks, args.rate, args.seed, args.width, args.height, clock)
+        finally:
+            renderer.close()
+
+    if args.renderer == "curses":
+        done, games, seconds = curses.wrapper(lambda stdscr: play(CursesRenderer(stdscr)))
+    elif args.renderer == "pygame":
+        import pygame as module
+        module.init()
+        screen = module.display.set_mode((args.width * 20, args.height * 20))
+        done, games, seconds = play(PygameRenderer(screen))
+        module.quit()
+    elif args.renderer == "ansi":
+        done, games, seconds = play(AnsiRenderer())
+    else:
+        done, games, seconds = play(NullRenderer())
+
+    print(f"{done} ticks in {seconds:.2f}s ({done / seconds:,.0f} ticks/s), {games} games")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Authoritative multiplayer snake server
+
+Runs an Arena at a fixed tick rate over plain asyncio TCP streams. Each
+client controls one snake; after the initial snapshot only per-tick deltas
+are broadcast. The delta is encoded once per tick and the same bytes are
+written to every client.
+
+    python snake_server.py --port 5555 --bots 10 --stats 5
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import sys
+import time
+from collections import deque
+
+import snake_net
+from snake_arena import Arena
+
+# Server settings (board matches the 40x30 grid of the pygame client)
+HOST = "0.0.0.0"
+PORT = 5555
+BOARD_WIDTH = 40
+BOARD_HEIGHT = 30
+TICK_RATE = 12
+FOOD_COUNT = 5
+MAX_WRITE_BUFFER = 256 * 1024  # Clients further behind than this are dropped
+STATS_WINDOW = 600             # Ticks kept for the latency/bandwidth stats
+
+log = logging.getLogger("snake.server")
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class ClientConnection:
+    def __init__(self, snake, reader, writer):
+        self.snake = snake
+        self.reader = reader
+        self.writer = writer
+        self.task = asyncio.current_task()
+        self.pending_direction = None
+        self.pending_seen_tick = 0
+
+
+class GameServer:
+    """Fixed-tick server owning the only copy of the game state."""
+
+    def __init__(self, host=HOST, port=PORT, width=BOARD_WIDTH, height=BOARD_HEIGHT,
+                 tick_rate=TICK_RATE, food_count=FOOD_COUNT, bots=0, wall_collision=False, seed=None,
+                 backlog=100):
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.tick_rate = tick_rate
+        self.arena = Arena(width, height, num_snakes=bots, food_count=food_count,
+                           wall_collision=wall_collision, seed=seed, track_changes=True)
+        self.cell_fmt = snake_net.cell_format(width, height)
+        self.clients = {}
+        self.server = None
+        self.tick_task = None
+        self.running = False
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        # Per tick stats
+        self.tick_times = deque(maxlen=STATS_WINDOW)      # Simulation + broadcast, seconds
+        self.fanout_times = deque(maxlen=STATS_WINDOW)    # Broadcast only, seconds
+        self.delta_sizes = deque(maxlen=STATS_WINDOW)     # Bytes in one delta frame
+        self.bytes_sent = deque(maxlen=STATS_WINDOW)      # Bytes written to all clients
+        self.dropped_clients = 0
+        self.overruns = 0        # Ticks that started after the next one was due
+        # Input stats
+        self.inputs_applied = 0
+        self.inputs_dropped = 0  # Replaced by a newer input before a tick used them
+        self.inputs_late = 0     # Sent by a client that was more than a tick behind
+
+    async def start(self):
+        """Start listening; with port=0 the OS picks a free port."""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                                 backlog=self.backlog)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.running = True
+        self.tick_task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        self.running = False
+        if self.tick_task:
+            self.tick_task.cancel()
+            try:
+                await self.tick_task
+            except asyncio.CancelledError:
+                pass
+        self.server.close()
+        tasks = []
+        for client in list(self.clients.values()):
+            tasks.append(client.task)
+            self.disconnect(client)
+        # Let the connection handlers see EOF and finish on their own
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def serve_forever(self, stats_interval=None):
+        await self.start()
+        print(f"Snake server listening on {self.host}:{self.port}")
+        try:
+            while True:
+                await asyncio.sleep(stats_interval or 3600)
+                if stats_interval:
+                    print(self.format_stats())
+        finally:
+            await self.stop()
+
+    async def handle_client(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        snake = self.arena.add_snake(ai=False)
+        client = ClientConnection(snake, reader, writer)
+        self.clients[snake.id] = client
+
+        # The snapshot is written before this client joins the broadcast list
+        # of the next tick, so no delta is missed or applied twice
+        writer.write(snake_net.encode_welcome(snake.id, self.arena.width, self.arena.height, self.tick_rate))
+        writer.write(self.encode_snapshot())
+
+        # Clients only send INPUT frames; anything longer is cut off at the header
+        frames = snake_net.FrameReader(max_length=snake_net.INPUT.size)
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for msg_type, payload in frames.feed(data):
+                    if msg_type != snake_net.MSG_INPUT or not self.handle_input(client, payload):
+                        return  # Malformed frame: the client is broken, drop it
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            self.disconnect(client)
+
+    def handle_input(self, client, payload):
+        """Queue a client's direction; returns False if the frame is malformed."""
+        if len(payload) != snake_net.INPUT.size:
+            return False
+        code, seen_tick = snake_net.INPUT.unpack(payload)
+        direction = snake_net.CODE_DIRECTIONS.get(code)
+        if direction is None:
+            return False
+        # Only the latest input before a tick counts
+        if client.pending_direction is not None:
+            self.inputs_dropped += 1
+        client.pending_direction = direction
+        client.pending_seen_tick = seen_tick
+        return True
+
+    def disconnect(self, client):
+        if self.clients.pop(client.snake.id, None) is None:
+            return
+        self.arena.remove_snake(client.snake)
+        client.writer.close()
+
+    def encode_snapshot(self):
+        cells = self.arena.grid.cells
+        occupied = [(index, owner) for index, owner in enumerate(cells) if owner]
+        return snake_net.encode_snapshot(self.arena.tick_count, occupied,
+                                         list(self.arena.food.items()), self.cell_fmt)
+
+    def encode_delta(self):
+        new_heads, freed_cells, food_added, food_removed = self.arena.take_changes()
+        # Food can be spawned and eaten within one tick; only send the net result
+        food = self.arena.food
+        food_added = [(cell, points) for cell, points in food_added if food.get(cell) == points]
+        food_removed = [cell for cell in set(food_removed) if cell not in food]
+        return snake_net.encode_delta(self.arena.tick_count, new_heads, freed_cells,
+                                      food_added, food_removed, self.cell_fmt)
+
+    def tick(self):
+        """Apply inputs, advance the arena and broadcast the delta."""
+        start = time.perf_counter()
+
+        # An input is late if the client sent it before seeing the latest
+        # tick, i.e. it reached us after the tick it was meant for
+        tick = self.arena.tick_count
+        for client in self.clients.values():
+            if client.pending_direction is not None:
+                client.snake.change_direction(client.pending_direction)
+                client.pending_direction = None
+                self.inputs_applied += 1
+                if client.pending_seen_tick < tick:
+                    self.inputs_late += 1
+
+        self.arena.tick()
+        delta = self.encode_delta()
+
+        fanout_start = time.perf_counter()
+        sent = 0
+        for client in list(self.clients.values()):
+            transport = client.writer.transport
+            if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                self.dropped_clients += 1
+                self.disconnect(client)
+                continue
+            client.writer.write(delta)
+            sent += len(delta)
+
+        end = time.perf_counter()
+        self.tick_times.append(end - start)
+        self.fanout_times.append(end - fanout_start)
+        self.delta_sizes.append(len(delta))
+        self.bytes_sent.append(sent)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        while self.running:
+            try:
+                self.tick()
+            except Exception:
+                # One bad tick must not stop the game for everyone
+                log.exception("Tick %d failed", self.arena.tick_count)
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Running behind; skip ahead rather than bursting ticks
+                next_tick = loop.time()
+                delay = 0
+                self.overruns += 1
+            await asyncio.sleep(delay)
+
+    def stats(self):
+        """Summary of the recent ticks (latency in milliseconds)."""
+        if not self.tick_times:
+            return {}
+        times = sorted(self.tick_times)
+        fanout = sorted(self.fanout_times)
+        return {
+            "clients": len(self.clients),
+            "ticks": len(times),
+            "tick_ms_mean": statistics.fmean(times) * 1000,
+            "tick_ms_p50": percentile(times, 0.50) * 1000,
+            "tick_ms_p90": percentile(times, 0.90) * 1000,
+            "tick_ms_p99": percentile(times, 0.99) * 1000,
+            "tick_ms_max": times[-1] * 1000,
+            "fanout_ms_mean": statistics.fmean(fanout) * 1000,
+            "fanout_ms_p99": percentile(fanout, 0.99) * 1000,
+            "delta_bytes_per_tick": statistics.fmean(self.delta_sizes),
+            "sent_bytes_per_tick": statistics.fmean(self.bytes_sent),
+            "dropped_clients": self.dropped_clients,
+            "overruns": self.overruns,
+            "inputs_applied": self.inputs_applied,
+            "inputs_dropped": self.inputs_dropped,
+            "inputs_late": self.inputs_late,
+        }
+
+    def format_stats(self):
+        stats = self.stats()
+        if not stats:
+            return "No ticks yet"
+        return (f"clients={stats['clients']} tick={stats['tick_ms_mean']:.2f}ms "
+                f"(p99 {stats['tick_ms_p99']:.2f}ms, max {stats['tick_ms_max']:.2f}ms) "
+                f"delta={stats['delta_bytes_per_tick']:.0f}B/tick "
+                f"sent={stats['sent_bytes_per_tick']:.0f}B/tick dropped={stats['dropped_clients']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multiplayer snake server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    parser.add_argument("--width", type=int, default=BOARD_WIDTH)
+    parser.add_argument("--height", type=int, default=BOARD_HEIGHT)
+    parser.add_argument("--bots", type=int, default=0, help="AI snakes to add to the board")
+    parser.add_argument("--walls", action="store_true", help="enable wall collision")
+    parser.add_argument("--stats", type=float, default=None, metavar="SECONDS",
+                        help="print tick latency and bytes/tick every SECONDS")
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, args.width, args.height, args.tick_rate,
+                        bots=args.bots, wall_collision=args.walls)
+    try:
+        asyncio.run(server.serve_forever(args.stats))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Decoded PCM cache for sound assets
+
+MP3/OGG assets are decoded once into 16-bit PCM at the mixer's format and
+stored as plain WAV files. Later launches memory-map the WAV and hand the
+samples straight to pygame.mixer.Sound(buffer=...), so no decoding happens
+at startup. Background music is streamed from the cached WAV.
+
+Cache entries are keyed by the SHA-1 of the source file; the file's mtime
+and size are remembered so unchanged files are not re-hashed every launch.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import wave
+
+import pygame
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snake_game_assets", ".pcm_cache")
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+
+# The cache stores signed 16-bit samples (pygame.mixer.init(44100, -16, 2))
+CACHED_SAMPLE_FORMAT = -16
+
+_index = None
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_FILE, 'r') as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = INDEX_FILE + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(_index, f)
+    os.replace(tmp, INDEX_FILE)
+
+
+def _file_hash(path, stat):
+    """SHA-1 of the file, reusing the stored hash while mtime and size match."""
+    index = _load_index()
+    key = os.path.abspath(path)
+    entry = index.get(key)
+    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return entry["sha1"]
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    index[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest.hexdigest()}
+    _save_index()
+    return index[key]["sha1"]
+
+
+def cache_path(path):
+    """Path of the cached WAV for a source file at the current mixer format."""
+    frequency, sample_format, channels = pygame.mixer.get_init()
+    sha1 = _file_hash(path, os.stat(path))
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{name}-{sha1[:16]}-{frequency}-{channels}ch.wav")
+
+
+def _write_wav(target, raw, frequency, channels):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = target + ".tmp"
+    with wave.open(tmp, 'wb') as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(frequency)
+        f.writeframes(raw)
+    os.replace(tmp, target)
+
+
+def _usable(path):
+    # WAV sources are already PCM and load just as fast without the cache
+    if path.lower().endswith(".wav"):
+        return False
+    init = pygame.mixer.get_init()
+    return init is not None and init[1] == CACHED_SAMPLE_FORMAT
+
+
+def _ensure_cached(path, target):
+    """Decode path into the cache; returns the decoded Sound if it had to."""
+    if os.path.exists(target):
+        return None
+    frequency, _, channels = pygame.mixer.get_init()
+    sound = pygame.mixer.Sound(path)
+    _write_wav(target, sound.get_raw(), frequency, channels)
+    return sound
+
+
+def load_sound(path):
+    """Drop-in replacement for pygame.mixer.Sound(path) backed by the cache."""
+    if not _usable(path):
+        return pygame.mixer.Sound(path)
+    try:
+        target = cache_path(path)
+        sound = _ensure_cached(path, target)
+        if sound is not None:
+            return sound
+
+        with open(target, 'rb') as f:
+            with wave.open(f) as w:
+                data_size = w.getnframes() * w.getnchannels() * w.getsampwidth()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # The samples are the last data_size bytes of the WAV file
+                samples = memoryview(mapped)[len(mapped) - data_size:]
+                try:
+                    return pygame.mixer.Sound(buffer=samples)
+                finally:
+                    samples.release()
+    except (OSError, EOFError, wave.Error):
+        # A broken cache must never stop the game from having sound
+        return pygame.mixer.Sound(path)
+
+
+def music_file(path):
+    """Cached WAV to give pygame.mixer.music.load instead of path."""
+    if not _usable(path):
+        return path
+    try:
+        target = cache_path(path)
+        _ensure_cached(path, target)
+        return target
+    except (OSError, pygame.error):
+        return path
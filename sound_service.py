@@ -0,0 +1,92 @@
+"""
+Non-blocking sound effects for the pygame games
+
+The game loop only drops a request on a queue; a background thread picks a
+channel from a small reserved pool and starts the sound. When every channel
+is busy the quietest-priority (then oldest) voice is stolen, or the request
+is dropped if everything playing matters more.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+
+import pygame
+
+CHANNELS = 4
+IDLE_VOICE = (float("-inf"), -1)  # A channel playing something we did not start
+
+log = logging.getLogger("snake.audio")
+
+
+class AudioService:
+    def __init__(self, channels=CHANNELS):
+        self.sounds = {}
+        self.requests = queue.SimpleQueue()  # put() never blocks the caller
+        self.order = itertools.count()
+        self.dropped = 0
+
+        # Reserve the first channels so pygame's automatic channel picking
+        # (e.g. Sound.play elsewhere) never takes them from us
+        try:
+            reserved = pygame.mixer.set_reserved(channels)
+            if reserved is None:  # pygame < 2.0.1 returns nothing
+                reserved = channels
+            self.channels = [pygame.mixer.Channel(i) for i in range(reserved)]
+        except pygame.error:
+            self.channels = []  # Mixer not initialized; play() does nothing
+        self.voices = [None] * len(self.channels)  # (priority, order) per channel
+
+        self.thread = threading.Thread(target=self.run, name="audio", daemon=True)
+        self.thread.start()
+
+    def add(self, name, sound, priority=0):
+        """Register a sound; higher priority sounds may interrupt lower ones."""
+        if sound is not None:
+            self.sounds[name] = (sound, priority)
+
+    def play(self, name):
+        """Queue a sound by name. Safe to call from the game loop every frame."""
+        if self.channels and name in self.sounds:
+            self.requests.put_nowait(name)
+
+    def stop(self):
+        self.requests.put_nowait(None)
+        self.thread.join(timeout=1.0)
+
+    def run(self):
+        while True:
+            name = self.requests.get()
+            if name is None:
+                return
+            try:
+                self.start(name)
+            except pygame.error:
+                self.dropped += 1
+            except Exception:
+                # One bad request must not silence the game for good
+                self.dropped += 1
+                log.exception("Could not play sound %r", name)
+
+    def start(self, name):
+        sound, priority = self.sounds[name]
+
+        index = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                index = i
+                break
+        else:
+            # Voice stealing: lowest priority first, oldest among equals. A
+            # channel busy with a sound started elsewhere has no voice and
+            # is taken first
+            victim = min(range(len(self.channels)), key=lambda i: self.voices[i] or IDLE_VOICE)
+            if (self.voices[victim] or IDLE_VOICE)[0] <= priority:
+                index = victim
+
+        if index is None:
+            self.dropped += 1
+            return
+        self.channels[index].play(sound)
+        self.voices[index] = (priority, next(self.order))
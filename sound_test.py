@@ -8,6 +8,8 @@ import sys
 import pygame
 import time
 
+from sound_cache import load_sound, music_file
+
 def main():
     print("Pygame Sound Test")
     print("-----------------")
@@ -57,7 +59,7 @@ def main():
         if os.path.exists(path):
             print(f"  Found {filename} at {path}")
             try:
-                sound = pygame.mixer.Sound(path)
+                sound = load_sound(path)
                 print(f"  Successfully loaded {filename}")
                 print(f"  Playing {filename}...")
                 sound.set_volume(1.0)  # Maximum volume
@@ -92,7 +94,7 @@ def main():
     if os.path.exists(bg_path):
         print(f"  Found background.mp3 at {bg_path}")
         try:
-            pygame.mixer.music.load(bg_path)
+            pygame.mixer.music.load(music_file(bg_path))
             print("  Successfully loaded background music")
             print("  Playing background music...")
             pygame.mixer.music.set_volume(1.0)  # Maximum volume
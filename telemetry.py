@@ -0,0 +1,129 @@
+"""
+Gameplay telemetry as a JSON-lines event stream
+
+emit() only appends a tuple to an in-memory deque; a background thread
+turns batches into JSON lines and writes them, so recording an event costs
+the game loop well under a microsecond and never touches the disk. Files
+rotate by size like logging.handlers.RotatingFileHandler: events.jsonl,
+events.jsonl.1, ... events.jsonl.<backups>.
+
+Each line is {"ms": <since start>, "event": <kind>, ...fields}.
+"""
+
+import atexit
+import collections
+import json
+import logging
+import os
+import threading
+import time
+
+MAX_BYTES = 1 << 20     # Rotate once the current file reaches 1 MB
+BACKUPS = 3             # Rotated files kept
+BATCH = 256             # Wake the writer early once this many events wait
+FLUSH_INTERVAL = 1.0    # Otherwise write at least once a second
+MAX_QUEUED = 100000     # Events held for the writer; older ones are dropped beyond this
+
+log = logging.getLogger("snake.telemetry")
+
+
+class NullTelemetry:
+    """Stand-in when telemetry is off; emit() does nothing."""
+
+    def emit(self, kind, **fields):
+        pass
+
+    def close(self):
+        pass
+
+
+class TelemetryWriter:
+    def __init__(self, path, max_bytes=MAX_BYTES, backups=BACKUPS, batch=BATCH,
+                 flush_interval=FLUSH_INTERVAL, max_queued=MAX_QUEUED):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self.start = time.monotonic()
+        # append/popleft are thread-safe; the bound keeps memory flat if the
+        # writer stalls or dies
+        self.events = collections.deque(maxlen=max_queued)
+        self.written = 0
+        self.dropped = 0  # Events pushed out of a full queue
+        self.wake = threading.Event()
+        self.stopping = False
+
+        self.file = open(path, "ab")
+        self.size = self.file.tell()  # Bytes, as max_bytes is
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def emit(self, kind, **fields):
+        events = self.events
+        if len(events) == events.maxlen:
+            self.dropped += 1
+        events.append((time.monotonic(), kind, fields))
+        if len(events) >= self.batch:
+            self.wake.set()
+
+    def run(self):
+        while not self.stopping:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.safe_flush()
+        self.safe_flush()
+
+    def safe_flush(self):
+        # An error loses at most the batch being written; the thread carries on
+        try:
+            self.flush()
+        except Exception:
+            log.exception("Could not write telemetry to %s", self.path)
+            if self.file.closed:
+                try:
+                    self.file = open(self.path, "ab")
+                    self.size = self.file.tell()
+                except OSError as e:
+                    log.warning("Could not reopen %s: %s", self.path, e)
+
+    def flush(self):
+        events = self.events
+        while events:
+            # One batch per write, so rotation keeps files near max_bytes
+            lines = []
+            while events and len(lines) < self.batch:
+                when, kind, fields = events.popleft()
+                record = {"ms": round((when - self.start) * 1000), "event": kind}
+                record.update(fields)
+                lines.append(json.dumps(record, separators=(",", ":"), default=repr))
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            if self.size and self.size + len(data) > self.max_bytes:
+                self.rotate()
+            self.file.write(data)
+            self.size += len(data)
+            self.written += len(lines)
+        self.file.flush()
+
+    def rotate(self):
+        self.file.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, "wb")
+        self.size = 0
+
+    def close(self):
+        """Write everything still queued and stop the writer thread."""
+        if self.stopping:
+            return
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        self.file.close()
@@ -0,0 +1,68 @@
+"""
+Pre-rendered tile atlas for grid games
+
+Every cell style (a fill color with a 1px border) is drawn once into a single
+sheet at startup. A layer of cells is then drawn with one Surface.blits call
+over (sheet, pixel position, tile area) triples instead of two
+pygame.draw.rect calls per cell. Pulsing cells get a strip of pre-rendered
+frames picked by a shared animation clock, so they cost one blit as well.
+"""
+
+import pygame
+
+BORDER_COLOR = (255, 255, 255)
+
+# Pulsing cells cycle through this many frames per period
+PULSE_FRAMES = 20
+PULSE_PERIOD = 1000  # Milliseconds
+
+
+class TileAtlas:
+    def __init__(self, cell_size, colors, border_color=BORDER_COLOR):
+        self.cell_size = cell_size
+        colors = list(dict.fromkeys(colors))  # Unique, in order
+
+        self.sheet = pygame.Surface((cell_size * len(colors), cell_size))
+        self.areas = {}
+        for i, color in enumerate(colors):
+            area = pygame.Rect(i * cell_size, 0, cell_size, cell_size)
+            self.sheet.fill(color, area)
+            pygame.draw.rect(self.sheet, border_color, area, 1)
+            self.areas[color] = area
+
+        # Match the display format so blits need no per-pixel conversion
+        if pygame.display.get_surface() is not None:
+            self.sheet = self.sheet.convert()
+
+
+class PulseFrames:
+    """Pre-rendered frames of a cell whose fill grows from `low` to full size.
+
+    Frame i shows the pulse at i / frames of the period, drawn over the black
+    background with the usual border, so an animated cell is one plain blit.
+    """
+
+    def __init__(self, cell_size, color, low, frames=PULSE_FRAMES, border_color=BORDER_COLOR):
+        self.sheet = pygame.Surface((cell_size * frames, cell_size))
+        self.areas = []
+        for i in range(frames):
+            area = pygame.Rect(i * cell_size, 0, cell_size, cell_size)
+            size = int(cell_size * (low + (1 - low) * i / frames))
+            offset = (cell_size - size) // 2
+            self.sheet.fill(color, (area.x + offset, offset, size, size))
+            pygame.draw.rect(self.sheet, border_color, area, 1)
+            self.areas.append(area)
+
+        if pygame.display.get_surface() is not None:
+            self.sheet = self.sheet.convert()
+
+
+def pulse_frame(ticks):
+    """Frame index of the shared animation clock at `ticks` milliseconds."""
+    return int(ticks) % PULSE_PERIOD * PULSE_FRAMES // PULSE_PERIOD
+
+
+def cell_pixels(grid_width, grid_height, cell_size):
+    """Map every (x, y) cell to its top-left pixel, computed once."""
+    return {(x, y): (x * cell_size, y * cell_size)
+            for x in range(grid_width) for y in range(grid_height)}
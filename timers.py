@@ -0,0 +1,88 @@
+"""
+Timer wheel for game expirations
+
+Things that run out (a power-up effect after N ticks, bonus food after N
+ms) are scheduled once instead of being checked every frame. A TimerWheel
+hashes each timer into one of `size` slots by its due time divided by
+`resolution`; advance(now) only visits the slots between the previous
+advance and now, so a tick costs the same with one timed entity or
+hundreds. Timers further out than one turn of the wheel simply stay in
+their slot until a later pass finds them due.
+
+Keys are anything hashable; scheduling a key again moves its timer, and
+cancelled or moved timers are dropped when their old slot comes round.
+"""
+
+WHEEL_SIZE = 64
+
+
+class TimerWheel:
+    def __init__(self, now=0, resolution=1, size=WHEEL_SIZE):
+        self.resolution = resolution
+        self.slots = [[] for _ in range(size)]
+        self.due = {}    # key -> due time of its live timer
+        self.now = now   # Time of the last advance
+        self.earliest = None  # Nothing is due before this (a lower bound)
+
+    def __contains__(self, key):
+        return key in self.due
+
+    def __len__(self):
+        return len(self.due)
+
+    def schedule(self, key, due):
+        """Fire key once the time reaches due (replacing any timer it had)."""
+        self.due[key] = due
+        if self.earliest is None or due < self.earliest:
+            self.earliest = due
+        # Already overdue: the current slot, which the next advance visits
+        slot = int(max(due, self.now) // self.resolution)
+        self.slots[slot % len(self.slots)].append((due, key))
+
+    def cancel(self, key):
+        self.due.pop(key, None)  # The slot entry goes when its slot is next visited
+
+    def remaining(self, key, now=None):
+        """Time from now (default: the last advance) until key fires, or 0 if it has no timer."""
+        due = self.due.get(key)
+        if due is None:
+            return 0
+        return due - (self.now if now is None else now)
+
+    def clear(self, now):
+        """Drop every timer and restart the wheel at now."""
+        for slot in self.slots:
+            slot.clear()
+        self.due.clear()
+        self.now = now
+        self.earliest = None
+
+    def advance(self, now):
+        """Move to now; returns the keys of timers due by then, earliest first."""
+        if self.earliest is None or now < self.earliest:
+            self.now = now  # The common case: one comparison, no slots visited
+            return []
+        slots, due_times, size = self.slots, self.due, len(self.slots)
+        first = int(self.now // self.resolution)
+        last = int(now // self.resolution)
+        self.now = now
+        fired = []
+        for index in range(first, min(last, first + size - 1) + 1):
+            slot = slots[index % size]
+            if not slot:
+                continue
+            keep = []
+            for entry in slot:
+                due, key = entry
+                if due_times.get(key) != due:
+                    continue  # Cancelled or rescheduled
+                if due <= now:
+                    del due_times[key]
+                    fired.append(entry)
+                else:
+                    keep.append(entry)
+            slot[:] = keep
+        self.earliest = min(due_times.values()) if due_times else None
+        if len(fired) > 1:
+            fired.sort(key=lambda entry: entry[0])
+        return [key for _, key in fired]